@@ -0,0 +1,131 @@
+from typing import List
+
+import numpy as np
+
+
+class EnergyGate:
+    """
+    Cheap energy gate deciding which frames are worth running the wake word model on.
+
+    The gate opens when a frame's RMS exceeds the adaptive noise floor by
+    `margin_db` (and `min_rms`), and stays open for `hangover_frames` after
+    the last loud frame. While it is closed, the last `context_frames` frames
+    are kept in a preallocated ring and replayed at onset, so the model sees
+    the lead-in of the wake word and not only what follows the gate opening.
+
+    The noise floor follows quiet frames: it drops quickly and rises slowly.
+    """
+
+    def __init__(
+        self,
+        frame_size: int = 1280,
+        margin_db: float = 10.0,
+        min_rms: float = 60.0,
+        hangover_frames: int = 25,
+        context_frames: int = 12,
+        floor_rise: float = 0.02,
+        floor_fall: float = 0.5,
+    ):
+        """
+        Args:
+            frame_size: Samples per frame.
+            margin_db: How far above the noise floor a frame must be to open the gate.
+            min_rms: RMS (int16 scale) below which the gate never opens.
+            hangover_frames: Frames the gate stays open after the last loud one (25 frames = 2 s).
+            context_frames: Frames replayed when the gate opens (12 frames = 960 ms).
+            floor_rise: Smoothing factor when the noise floor goes up.
+            floor_fall: Smoothing factor when the noise floor goes down.
+        """
+        self._ratio = 10 ** (margin_db / 20)
+        self._min_rms = min_rms
+        self._hangover_frames = hangover_frames
+        self._floor_rise = floor_rise
+        self._floor_fall = floor_fall
+        self._context = np.zeros((context_frames, frame_size), dtype=np.int16)
+        self._context_start = 0
+        self._context_count = 0
+        self._hangover = 0
+        self.noise_floor = None
+        self.rms = 0.0
+
+        self.frames = 0
+        self.passed_frames = 0
+        self.onsets = 0
+
+    @property
+    def is_open(self) -> bool:
+        return self._hangover > 0
+
+    @property
+    def threshold(self) -> float:
+        """RMS a frame must exceed to open the gate."""
+        if self.noise_floor is None:
+            return self._min_rms
+        return max(self._min_rms, self.noise_floor * self._ratio)
+
+    @property
+    def duty_cycle(self) -> float:
+        """Share of the frames handed to the model (context replays included)."""
+        return self.passed_frames / self.frames if self.frames else 1.0
+
+    def reset(self) -> None:
+        """Close the gate and forget the buffered context; the noise floor is kept."""
+        self._hangover = 0
+        self._context_count = 0
+
+    def process(self, frame: np.ndarray) -> List[np.ndarray]:
+        """
+        Run one frame through the gate.
+
+        Returns:
+            The frames to run the model on, in order: none while the gate is
+            closed, the buffered context then `frame` at onset, `frame` while open.
+        """
+        self.frames += 1
+        self.rms = float(np.sqrt(np.mean(np.square(frame, dtype=np.float32))))
+        loud = self.rms > self.threshold
+
+        if not loud:
+            self._update_floor()
+        if loud:
+            opening = not self.is_open
+            self._hangover = self._hangover_frames
+            if opening:
+                self.onsets += 1
+                frames = self._drain_context()
+                frames.append(frame)
+                self.passed_frames += len(frames)
+                return frames
+        elif self.is_open:
+            self._hangover -= 1
+
+        if self.is_open:
+            self.passed_frames += 1
+            return [frame]
+        self._keep_context(frame)
+        return []
+
+    def _update_floor(self) -> None:
+        if self.noise_floor is None:
+            self.noise_floor = self.rms
+            return
+        alpha = self._floor_fall if self.rms < self.noise_floor else self._floor_rise
+        self.noise_floor += alpha * (self.rms - self.noise_floor)
+
+    def _keep_context(self, frame: np.ndarray) -> None:
+        capacity = len(self._context)
+        if capacity == 0:
+            return
+        end = (self._context_start + self._context_count) % capacity
+        self._context[end] = frame
+        if self._context_count < capacity:
+            self._context_count += 1
+        else:
+            self._context_start = (self._context_start + 1) % capacity
+
+    def _drain_context(self) -> List[np.ndarray]:
+        capacity = len(self._context)
+        frames = [self._context[(self._context_start + i) % capacity] for i in range(self._context_count)]
+        self._context_start = 0
+        self._context_count = 0
+        return frames
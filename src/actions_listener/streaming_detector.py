@@ -0,0 +1,88 @@
+from typing import List, Optional, Sequence
+
+from .wake_word_thresholds import WakeWordThresholds
+
+
+class StreamingDetector:
+    """
+    Turns per-frame scores of N wake word models into trigger events.
+
+    Each model has a fixed-size circular buffer of its last scores and a
+    running sum, so smoothing is O(1) per frame. A model triggers on the
+    rising edge of (score > trigger_score and average > trigger_average),
+    then stays latched until its score falls below release_score, and cannot
+    trigger again for refractory_frames frames.
+
+    All state is allocated up front: update() allocates nothing.
+    """
+
+    def __init__(self, labels: Sequence[str], thresholds: Optional[WakeWordThresholds] = None):
+        """
+        Args:
+            labels: Names of the scored models, in the order of their index.
+            thresholds: Decision rule; defaults to WakeWordThresholds().
+        """
+        self.labels = list(labels)
+        self.thresholds = thresholds or WakeWordThresholds()
+        window = self.thresholds.smoothing_window
+        count = len(self.labels)
+        self._scores: List[List[float]] = [[0.0] * window for _ in range(count)]
+        self._sums = [0.0] * count
+        self._positions = [0] * count
+        self._filled = [0] * count
+        self._latched = [False] * count
+        self._refractory = [0] * count
+
+    def reset(self) -> None:
+        """Forget all scores and re-arm every model."""
+        for index in range(len(self.labels)):
+            scores = self._scores[index]
+            for i in range(len(scores)):
+                scores[i] = 0.0
+            self._sums[index] = 0.0
+            self._positions[index] = 0
+            self._filled[index] = 0
+            self._latched[index] = False
+            self._refractory[index] = 0
+
+    def average(self, index: int) -> float:
+        """Mean of the model's last `smoothing_window` scores (fewer at start)."""
+        filled = self._filled[index]
+        return self._sums[index] / filled if filled else 0.0
+
+    def update(self, index: int, score: float) -> bool:
+        """
+        Add the latest score of model `index`.
+
+        Returns:
+            True if the model triggers on this frame.
+        """
+        scores = self._scores[index]
+        position = self._positions[index]
+        self._sums[index] += score - scores[position]
+        scores[position] = score
+        position += 1
+        if position == len(scores):
+            position = 0
+            # Recompute from scratch once per lap so float error can't accumulate
+            self._sums[index] = sum(scores)
+        self._positions[index] = position
+        if self._filled[index] < len(scores):
+            self._filled[index] += 1
+
+        if self._refractory[index]:
+            self._refractory[index] -= 1
+
+        thresholds = self.thresholds
+        if self._latched[index]:
+            if score < thresholds.release_score:
+                self._latched[index] = False
+            return False
+
+        if score > thresholds.trigger_score and self.average(index) > thresholds.trigger_average:
+            self._latched[index] = True
+            if self._refractory[index]:
+                return False
+            self._refractory[index] = thresholds.refractory_frames
+            return True
+        return False
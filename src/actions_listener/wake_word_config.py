@@ -0,0 +1,48 @@
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from .wake_word_thresholds import WakeWordThresholds
+
+_SCRIPT_DIR = Path(__file__).parent
+
+
+@dataclass
+class WakeWordConfig:
+    """Configuration of the wake word model, its inference backend and the detection rule."""
+
+    # "tflite" (tflite_runtime) or "onnx" (onnxruntime)
+    inference_framework: str = "tflite"
+    # Threads of the melspectrogram and embedding models, which are most of the inference cost
+    ncpu: int = 1
+    # Wake word model; defaults to hey_jarvis_v0.1 in the format of the framework.
+    # Point it (and the feature models below) to quantized or fp16 exports to change precision
+    model_path: Optional[str] = None
+    # Feature models; empty: the float32 models bundled with openWakeWord
+    melspec_model_path: str = ""
+    embedding_model_path: str = ""
+    verifier_path: Optional[str] = str(_SCRIPT_DIR / "hey_jarvis_retrained.pkl")
+    verifier_threshold: float = 0.9
+    enable_speex_noise_suppression: bool = True
+    vad_threshold: float = 0.8
+    # Skip inference on frames the energy gate considers silent
+    use_energy_gate: bool = True
+    thresholds: WakeWordThresholds = field(default_factory=WakeWordThresholds)
+
+    def __post_init__(self):
+        if self.inference_framework not in ("tflite", "onnx"):
+            raise ValueError(f"Unknown wake word inference framework: {self.inference_framework}")
+
+    @property
+    def resolved_model_path(self) -> str:
+        if self.model_path:
+            return self.model_path
+        return str(_SCRIPT_DIR / f"hey_jarvis_v0.1.{self.inference_framework}")
+
+    @property
+    def model_name(self) -> str:
+        """Name openWakeWord gives the model: its file name without extension."""
+        return Path(self.resolved_model_path).stem
+
+    def describe(self) -> str:
+        return f"{self.inference_framework}, ncpu={self.ncpu}, model={Path(self.resolved_model_path).name}"
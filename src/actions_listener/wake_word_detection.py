@@ -0,0 +1,15 @@
+from dataclasses import dataclass
+
+
+@dataclass
+class WakeWordDetection:
+    """A wake word detected by the worker thread, published to the event loop."""
+
+    model: str
+    score: float
+    sliding_avg: float
+    rms: float
+    # Capture position right after the frame that triggered the detection
+    position: int
+    # time.monotonic() when the detection was made
+    detected_at: float
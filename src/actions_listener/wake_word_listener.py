@@ -1,95 +1,170 @@
-import numpy as np
-import pyaudio
-from pathlib import Path
 from logger import logger, AppMessage, ErrorMessage
-from openwakeword.model import Model
+from llm_engine.audio import PolyphaseResampler, MicrophoneCapture
 import asyncio
+import threading
+import time
+from typing import Optional
+from .wake_word_config import WakeWordConfig
+from .wake_word_detection import WakeWordDetection
+from .wake_word_pipeline import WakeWordPipeline
+
+
+def capture_resampler(capture_rate: int) -> PolyphaseResampler:
+    """Resampler from the microphone rate to the pipeline's 16 kHz, one pipeline frame per block."""
+    return PolyphaseResampler(
+        capture_rate,
+        WakeWordPipeline.SAMPLE_RATE,
+        WakeWordPipeline.FRAME_SIZE * capture_rate // WakeWordPipeline.SAMPLE_RATE,
+    )
+
 
-_SCRIPT_DIR = Path(__file__).parent
 class WakeWordListener:
-    MAX_BUFFER_SIZE = 1000
-    #SILENCE_THRESHOLD = 500
-    def __init__(self):
+    # Seconds between two reports of the gate duty cycle
+    STATS_INTERVAL = 600
+    # Frames the worker may fall behind the microphone before skipping ahead
+    MAX_LAG_FRAMES = 4
+    DETECTION_QUEUE_SIZE = 1
+
+    def __init__(self, capture: MicrophoneCapture, config: Optional[WakeWordConfig] = None):
         self._detect_callback = None
-        self._wake_word_is_detected = False
-        self.listening = True
-        self._paused = False
-        self.audio = pyaudio.PyAudio()
-        # Load the wake word model
-        self.oww_model = Model(wakeword_models=[str(_SCRIPT_DIR / "hey_jarvis_v0.1.tflite")],
-                               enable_speex_noise_suppression=True,
-                               vad_threshold=0.8,
-                               inference_framework="tflite",
-                               custom_verifier_models={"hey_jarvis_v0.1": str(_SCRIPT_DIR / "hey_jarvis_retrained.pkl")},
-                                custom_verifier_threshold=0.9)
-        self.mic_stream = None
-    
-    
+        # Stop event of the current worker: each start_listening() gets its own
+        self._stop = threading.Event()
+        self._stop.set()
+        # Set while the worker thread should run detection (cleared during sessions)
+        self._active = threading.Event()
+        self._reset_requested = False
+        self._worker = None
+        self._worker_error = None
+        self._loop = None
+        self._detections = None
+        self.dropped_frames = 0
+        self.dropped_detections = 0
+        # Shared always-on microphone, resampled from its rate to 16 kHz
+        self._capture = capture
+        self._resampler = capture_resampler(capture.sample_rate)
+        self._reader = None
+        # Capture position right after the frame that triggered the last detection
+        self.detection_position = None
+        self.last_detection: Optional[WakeWordDetection] = None
+        # Loaded once; resume() only resets its state
+        self._pipeline = WakeWordPipeline(config)
+
+    @property
+    def listening(self) -> bool:
+        return not self._stop.is_set()
 
     async def start_listening(self):
-        self.listening = True
-        self.mic_stream = self.audio.open(format=pyaudio.paInt16, channels=1, rate=16000, input=True,
-                                          frames_per_buffer=1280)
-        while self.listening:
-            if not self._paused:
-                try:
-                    # Capture audio
-                    audio_data = np.frombuffer(self.mic_stream.read(1280), dtype=np.int16)
-
-                    rms = np.sqrt(np.mean(audio_data.astype(np.float32) ** 2))
-                    #print(f"--- RMS: {rms}")
-                    #if rms < self.SILENCE_THRESHOLD:
-                     #   continue  # Ignore ce buffer, trop silencieux
-
-                    # Predict using the model
-                    prediction = self.oww_model.predict(audio_data)
-    
-                    # Check if any model detected the wakeword
-                    for mdl in self.oww_model.prediction_buffer.keys():
-                        scores = list(self.oww_model.prediction_buffer[mdl])
-                        sliding_avg = round(np.mean(scores[-3:]), 2)
-                        if scores[-1] > 0.5:
-                            print(round(scores[-1],2), f"avg3: {sliding_avg}")
-                            logger.log(AppMessage(content=f"~~~~\nNo detection, but score: {round(scores[-1],2)} \nsliding_avg: {round(sliding_avg, 2)} \nRMS: {round(rms,2)}\n~~~~"))
-                        #if scores[-1] > 0.8:  # Threshold for detection
-                        if scores[-1] > 0.8 and sliding_avg > 0.6: # Trying something else
-                            if not self._wake_word_is_detected:
-                                self._wake_word_is_detected = True
-                                logger.log(AppMessage(content=f"Wakeword detected with sliding_avg: {round(sliding_avg, 2)} \nscore: {round(scores[-1],2)} \nRMS: {round(rms,2)}"))
-                               # print(f"===> Wakeword detected with sliding_avg: {round(sliding_avg, 2)} \nscore: {round(scores[-1],2)} \nRMS: {round(rms,2)}")
-                                await self._detect_callback()
-                        else:
-                            self._wake_word_is_detected = False
-                    if len(self.oww_model.prediction_buffer) > self.MAX_BUFFER_SIZE:
-                        self.oww_model.prediction_buffer.clear()  # Or implement a rolling buffer mechanism
-
-                except Exception as e:
-                    logger.log(ErrorMessage(content=f"{self.__class__.__name__} : start_listening: {e}"))
-                    raise Exception(f"{self.__class__.__name__} : start_listening: {e}")
-            await asyncio.sleep(0.01)  # Prevent tight loop
+        """Run detection in a worker thread and handle its detections on the event loop."""
+        if self._worker is not None and self._worker.is_alive():
+            # Only one worker may use the model: let the previous one finish first, off the event loop
+            self._stop.set()
+            self._active.set()
+            await asyncio.to_thread(self._worker.join)
+        stop = threading.Event()
+        detections = asyncio.Queue(maxsize=self.DETECTION_QUEUE_SIZE)
+        self._stop = stop
+        self._detections = detections
+        self._loop = asyncio.get_running_loop()
+        self._worker_error = None
+        self._capture.start()
+        self._reader = self._capture.reader()
+        # A previous run may have left the model and the resampler mid-stream
+        self._reset_requested = True
+        self._active.set()
+        self._worker = threading.Thread(target=self._detection_loop, args=(stop, detections), name="wake-word", daemon=True)
+        self._worker.start()
+
+        while not stop.is_set():
+            detection = await detections.get()
+            if detection is None:  # The worker stopped
+                break
+            self.detection_position = detection.position
+            self.last_detection = detection
+            logger.log(AppMessage(content=f"Wakeword detected with sliding_avg: {round(detection.sliding_avg, 2)} \nscore: {round(detection.score,2)} \nRMS: {round(detection.rms,2)} \nqueued for {(time.monotonic() - detection.detected_at) * 1000:.1f}ms"))
+            await self._detect_callback()
+
+        if self._worker_error is not None:
+            raise Exception(f"{self.__class__.__name__} : start_listening: {self._worker_error}")
+
+    def _detection_loop(self, stop: threading.Event, detections: asyncio.Queue):
+        """
+        Worker thread: the only one touching the model. Reads the microphone, predicts, publishes detections.
+
+        `stop` and `detections` belong to this worker's run: a later start_listening()
+        never shares them, so a worker that is still exiting cannot be revived or
+        publish to its successor.
+        """
+        try:
+            frame_size = self._resampler.block_size
+            last_stats = time.monotonic()
+            while not stop.is_set():
+                if not self._active.wait(0.5):
+                    continue
+                if self._reset_requested:
+                    self._reset_requested = False
+                    self._pipeline.reset()
+                    # Skip what was said during the session
+                    self._reader.seek_latest()
+                    self._resampler.reset()
+
+                # Backpressure: never fall more than a few frames behind the microphone
+                if self._reader.lag > self.MAX_LAG_FRAMES * frame_size:
+                    skipped = self._reader.lag // frame_size
+                    self.dropped_frames += skipped
+                    self._reader.seek(self._reader.position + skipped * frame_size)
+                    self._resampler.reset()
+                    logger.log(AppMessage(content=f"{self.__class__.__name__}: fell behind, dropped {skipped} frames ({self.dropped_frames} total)"))
+
+                frame = self._reader.read(frame_size, 0.5)
+                if frame is None or not self._active.is_set() or stop.is_set():
+                    continue
+                detection = self._pipeline.process(self._resampler.process(frame), self._reader.position)
+                if time.monotonic() - last_stats > self.STATS_INTERVAL:
+                    last_stats = time.monotonic()
+                    logger.log(AppMessage(content=f"{self.__class__.__name__}: {self._pipeline.stats()}"))
+                if detection is not None:
+                    # Stay paused until resume(): nothing to detect while the session runs
+                    self._active.clear()
+                    self._loop.call_soon_threadsafe(self._publish, detections, detection)
+        except Exception as e:
+            self._worker_error = e
+            logger.log(ErrorMessage(content=f"{self.__class__.__name__} : _detection_loop: {e}"))
+        finally:
+            stop.set()
+            self._loop.call_soon_threadsafe(self._publish_stop, detections)
+
+    def _publish(self, detections: asyncio.Queue, detection):
+        """Event loop side: queue a detection, dropping it if the previous ones were not handled yet."""
+        try:
+            detections.put_nowait(detection)
+        except asyncio.QueueFull:
+            self.dropped_detections += 1
+            logger.log(AppMessage(content=f"{self.__class__.__name__}: detection dropped, {self.dropped_detections} so far"))
+
+    def _publish_stop(self, detections: asyncio.Queue):
+        while not detections.empty():
+            detections.get_nowait()
+        detections.put_nowait(None)
 
     def stop_listening(self):
-        self.listening = False
-        self.mic_stream.stop_stream()
+        # Only signals: called on the event loop, which must not wait for the worker.
+        # It exits within one read timeout; start_listening() waits for it before starting another
+        self._stop.set()
+        self._active.set()
+        logger.log(AppMessage(content=f"{self.__class__.__name__}: {self._pipeline.stats()}, dropped_frames={self.dropped_frames}"))
 
     def pause(self):
-        self._paused = True
-        self.mic_stream.stop_stream()
-        self.mic_stream.close() 
-    
+        # The microphone keeps running: other consumers read it while we are paused
+        self._active.clear()
+
     def resume(self):
-        self._wake_word_is_detected = False
-        #self.oww_model.reset()
-        self.oww_model = Model(
-            wakeword_models=[str(_SCRIPT_DIR / "hey_jarvis_v0.1.tflite")],
-            enable_speex_noise_suppression=True,
-            vad_threshold=0.8,
-            inference_framework="tflite",
-            custom_verifier_models={"hey_jarvis_v0.1": str(_SCRIPT_DIR / "hey_jarvis_retrained.pkl")},
-            custom_verifier_threshold=0.9
-            )
-        self.mic_stream = self.audio.open(format=pyaudio.paInt16, channels=1, rate=16000, input=True, frames_per_buffer=1280)
-        self._paused = False
+        # Detections made before the session are stale
+        if self._detections is not None:
+            while not self._detections.empty():
+                self._detections.get_nowait()
+        # The worker resets the model itself: it is the only thread using it
+        self._reset_requested = True
+        self._active.set()
 
     def set_detection_callback(self, callback):
         self._detect_callback = callback
@@ -0,0 +1,25 @@
+import time
+
+from openwakeword.model import Model
+
+from logger import logger, AppMessage
+from .wake_word_config import WakeWordConfig
+
+
+def load_wake_word_model(config: WakeWordConfig) -> Model:
+    """Build the openWakeWord model described by `config`, logging how long it took."""
+    start = time.monotonic()
+    custom_verifier_models = {config.model_name: config.verifier_path} if config.verifier_path else {}
+    model = Model(
+        wakeword_models=[config.resolved_model_path],
+        enable_speex_noise_suppression=config.enable_speex_noise_suppression,
+        vad_threshold=config.vad_threshold,
+        inference_framework=config.inference_framework,
+        custom_verifier_models=custom_verifier_models,
+        custom_verifier_threshold=config.verifier_threshold,
+        ncpu=config.ncpu,
+        melspec_model_path=config.melspec_model_path,
+        embedding_model_path=config.embedding_model_path,
+    )
+    logger.log(AppMessage(content=f"wake word model loaded ({config.describe()}) in {(time.monotonic() - start) * 1000:.0f}ms"))
+    return model
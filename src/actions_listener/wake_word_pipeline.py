@@ -0,0 +1,149 @@
+import time
+from typing import List, Optional
+
+import numpy as np
+
+from logger import logger, AppMessage
+from .energy_gate import EnergyGate
+from .streaming_detector import StreamingDetector
+from .wake_word_config import WakeWordConfig
+from .wake_word_detection import WakeWordDetection
+from .wake_word_model import load_wake_word_model
+
+
+class WakeWordPipeline:
+    """
+    openWakeWord model behind an optional EnergyGate: 80 ms frames of 16 kHz audio in, detections out.
+
+    It knows nothing about the microphone, so the listener's worker thread
+    and the offline benchmarks run the exact same code.
+    """
+
+    # openWakeWord expects 80 ms frames of 16 kHz audio
+    SAMPLE_RATE = 16000
+    FRAME_SIZE = 1280
+
+    def __init__(self, config: Optional[WakeWordConfig] = None, gate: Optional[EnergyGate] = None):
+        """
+        Args:
+            config: Model, backend and detection settings; defaults to WakeWordConfig().
+            gate: Energy gate to use instead of the default one (when config.use_energy_gate).
+        """
+        self.config = config or WakeWordConfig()
+        # Every frame is inferred without a gate
+        self._gate = gate or (EnergyGate(self.FRAME_SIZE) if self.config.use_energy_gate else None)
+        # Load the wake word model once; reset() only resets its state
+        self.oww_model = load_wake_word_model(self.config)
+        # The preprocessor starts from embeddings of random noise, which are costly to compute: keep a copy
+        self._initial_features = self.oww_model.preprocessor.feature_buffer.copy()
+        self.detector = StreamingDetector(self._labels(), self.config.thresholds)
+
+        self.frames = 0
+        self.inferred_frames = 0
+        # CPU time of the calling thread spent in Model.predict
+        self.inference_time = 0.0
+
+    @property
+    def duty_cycle(self) -> float:
+        """Share of the frames the model ran on."""
+        return self.inferred_frames / self.frames if self.frames else 1.0
+
+    @property
+    def cpu_saved(self) -> float:
+        """Estimated inference CPU seconds the gate saved."""
+        if not self.inferred_frames:
+            return 0.0
+        return max(0, self.frames - self.inferred_frames) * self.inference_time / self.inferred_frames
+
+    def stats(self) -> str:
+        return (
+            f"frames={self.frames}, duty_cycle={self.duty_cycle:.1%}, "
+            f"inference_cpu={self.inference_time:.1f}s, cpu_saved~{self.cpu_saved:.1f}s"
+        )
+
+    def _labels(self) -> List[str]:
+        """Score labels produced by the loaded models (one per model, or one per class)."""
+        labels = []
+        for mdl in self.oww_model.models.keys():
+            if self.oww_model.model_outputs[mdl] == 1:
+                labels.append(mdl)
+            else:
+                labels.extend(self.oww_model.class_mapping[mdl].values())
+        return labels
+
+    def reset(self):
+        """
+        Forget the audio heard so far, as a freshly loaded model would, without reloading anything.
+
+        Resets private openWakeWord 0.5.1 state (preprocessor buffers, VAD
+        buffer), hence the exact pin in requirements.txt. The speex noise
+        suppressor is recreated too (0.1 ms): its noise estimate would
+        otherwise still be the one of the audio before the session.
+        """
+        start = time.monotonic()
+        self.detector.reset()
+        self.oww_model.reset()
+        preprocessor = self.oww_model.preprocessor
+        preprocessor.raw_data_buffer.clear()
+        preprocessor.melspectrogram_buffer = np.ones((76, 32))
+        preprocessor.accumulated_samples = 0
+        preprocessor.raw_data_remainder = np.empty(0)
+        preprocessor.feature_buffer = self._initial_features.copy()
+        if self.oww_model.vad_threshold > 0:
+            self.oww_model.vad.reset_states()
+            self.oww_model.vad.prediction_buffer.clear()
+        if self.oww_model.speex_ns is not None:
+            from speexdsp_ns import NoiseSuppression
+            self.oww_model.speex_ns = NoiseSuppression.create(160, self.SAMPLE_RATE)
+        if self._gate is not None:
+            self._gate.reset()
+        logger.log(AppMessage(content=f"{self.__class__.__name__}: wake word model reset in {(time.monotonic() - start) * 1000:.1f}ms"))
+
+    def process(self, audio_data: np.ndarray, position: int = 0) -> Optional[WakeWordDetection]:
+        """
+        Run one frame through the gate and the model.
+
+        Args:
+            audio_data: FRAME_SIZE int16 samples at 16 kHz.
+            position: Position reported in the detection (e.g. capture position right after the frame).
+        """
+        self.frames += 1
+        if self._gate is None:
+            return self._predict(audio_data, position)
+
+        detection = None
+        for frame in self._gate.process(audio_data):
+            detection = self._predict(frame, position) or detection
+        return detection
+
+    def _predict(self, audio_data: np.ndarray, position: int) -> Optional[WakeWordDetection]:
+        """Predict on one 80 ms frame; returns a WakeWordDetection when the wake word is detected."""
+        rms = np.sqrt(np.mean(audio_data.astype(np.float32) ** 2))
+
+        # Predict using the model
+        start = time.thread_time()
+        self.oww_model.predict(audio_data)
+        self.inference_time += time.thread_time() - start
+        self.inferred_frames += 1
+
+        detection = None
+        # Check if any model detected the wakeword. The latest score of each model is
+        # read from its prediction buffer (before the VAD zeroing applied to `prediction`)
+        prediction_buffer = self.oww_model.prediction_buffer
+        for index, label in enumerate(self.detector.labels):
+            score = float(prediction_buffer[label][-1])
+            triggered = self.detector.update(index, score)
+            if score > 0.5:
+                sliding_avg = self.detector.average(index)
+                print(round(score, 2), f"avg{self.detector.thresholds.smoothing_window}: {sliding_avg:.2f}")
+                logger.log(AppMessage(content=f"~~~~\nNo detection, but score: {round(score,2)} \nsliding_avg: {round(sliding_avg, 2)} \nRMS: {round(rms,2)}\n~~~~"))
+            if triggered:
+                detection = WakeWordDetection(
+                    model=label,
+                    score=score,
+                    sliding_avg=self.detector.average(index),
+                    rms=float(rms),
+                    position=position,
+                    detected_at=time.monotonic(),
+                )
+        return detection
@@ -0,0 +1,16 @@
+from dataclasses import dataclass
+
+
+@dataclass
+class WakeWordThresholds:
+    """Decision rule applied by the StreamingDetector to each wake word model's scores."""
+
+    # Trigger when the latest score and the smoothed score are both above these
+    trigger_score: float = 0.8
+    trigger_average: float = 0.6
+    # Once triggered, the model re-arms only after its score falls below this (hysteresis)
+    release_score: float = 0.5
+    # Number of scores averaged (80 ms each)
+    smoothing_window: int = 3
+    # Frames after a trigger during which the model cannot trigger again (25 frames = 2 s)
+    refractory_frames: int = 25
@@ -1,15 +1,19 @@
 import asyncio
+import json
 from contextlib import asynccontextmanager
+from typing import Optional
 
 from dotenv import load_dotenv
 load_dotenv()
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from assistant import Assistant
 import uvicorn
+from config import Config
 from logger import logger
+from tracing import trace_store
 
 
-logger.reset()
 assistant = Assistant()
 
 
@@ -24,13 +28,74 @@ app = FastAPI(lifespan=lifespan)
 
 # Define FastAPI route to serve the JSON
 @app.get("/json")
-async def serve_json():
+def serve_json():
+    # Plain def: flushing the writer and reading every segment happen in FastAPI's threadpool
     return logger.get_json_file()
 
+@app.get("/logs")
+def query_logs(
+    cursor: Optional[int] = Query(None, ge=0),
+    since: Optional[str] = None,
+    role: Optional[list[str]] = Query(None),
+    limit: int = Query(100, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
+    tail: bool = False,
+):
+    # Plain def: FastAPI runs it in its threadpool, off the event loop driving the audio
+    try:
+        return logger.query(cursor=cursor, since=since, roles=role, limit=limit, offset=offset, tail=tail)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid since: {e}")
+
+@app.get("/logs/follow")
+async def follow_logs(
+    request: Request,
+    cursor: Optional[int] = Query(None, ge=0),
+    role: Optional[list[str]] = Query(None),
+):
+    """Server-Sent Events stream of the records written from `cursor` on (default: from now)."""
+    last_event_id = request.headers.get("last-event-id")
+    if last_event_id is not None and last_event_id.isdigit():
+        cursor = int(last_event_id) + 1
+    if cursor is None:
+        cursor = logger.next_cursor
+
+    async def events():
+        position = cursor
+        idle = 0.0
+        while not await request.is_disconnected():
+            if position > logger.next_cursor:  # The log has been reset
+                position = 0
+            page = await asyncio.to_thread(logger.query, cursor=position, roles=role, limit=100)
+            for record in page.records:
+                yield f"id: {record['cursor']}\ndata: {json.dumps(record, ensure_ascii=False)}\n\n"
+            position = page.next_cursor
+            if page.records:
+                idle = 0.0
+                continue
+            if idle >= 15:
+                yield ": keep-alive\n\n"
+                idle = 0.0
+            await asyncio.sleep(Config.LOGS_FOLLOW_POLL_INTERVAL)
+            idle += Config.LOGS_FOLLOW_POLL_INTERVAL
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+@app.get("/traces")
+async def recent_traces(limit: int = Query(20, ge=1, le=500)):
+    """Latency traces of the last turns, newest first (ms offsets from the wake word)."""
+    return trace_store.recent(limit)
+
+@app.get("/traces/summary")
+async def traces_summary(limit: Optional[int] = Query(None, ge=1)):
+    """count/p50/p95/max in ms of each turn interval over the last `limit` turns."""
+    return trace_store.summary(limit)
+
 @app.post("/restart")
 async def restart():
     assistant.stop()
-    logger.reset()
+    # Start the new run in a fresh segment; the history is kept (rotation and retention prune it)
+    await asyncio.to_thread(logger.rotate)
     asyncio.create_task(assistant.start())
     return {"message": "Assistant restarted successfully"}
 
@@ -1,10 +1,10 @@
-import subprocess
-
-from config import Config
+from llm_engine.audio import MicrophoneCapture
+from llm_engine.models import AudioConfig
 from llm_engine.real_time_engine import RealTimeEngine
 from logger import logger, AppMessage, ErrorMessage
 from session.assistant_context import AssistantContext, AssistantState
 from tools.tools_library import tools
+from tracing import TurnTrace, trace_store
 from actions_listener.wake_word_listener import WakeWordListener
 
 
@@ -13,19 +13,27 @@ class Assistant:
 
     def __init__(self):
         try:
-            self.action_listener = WakeWordListener()
-            self.real_time_engine = RealTimeEngine(tools=tools.values())
+            audio_config = AudioConfig()
+            # One microphone stream shared by the wake word listener and the realtime sessions
+            self.microphone = MicrophoneCapture(audio_config)
+            self.action_listener = WakeWordListener(self.microphone)
+            self.real_time_engine = RealTimeEngine(
+                tools=tools.values(), audio_config=audio_config, capture=self.microphone
+            )
             self.action_listener.set_detection_callback(self._real_time_listening)
             self.context = AssistantContext()
             self.state = AssistantState.OFF
         except Exception as e:
             raise Exception(f"{self.__class__.__name__} : __init__: {e}")
 
-    def notify_sound(self):
-        player_command = ["ffplay", "-nodisp", "-autoexit", str(Config.NOTIFICATION_SOUND)]
-        subprocess.run(player_command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    async def notify_sound(self):
+        await self.real_time_engine.notify()
 
     async def _real_time_listening(self):
+        trace = TurnTrace()
+        detection = self.action_listener.last_detection
+        if detection is not None:
+            trace.mark("wake_word", detection.detected_at)
         try:
             self.action_listener.pause()
             self.state = AssistantState.THINKING
@@ -37,6 +45,8 @@ class Assistant:
                 on_assistant_transcript=lambda text: self.context.running_conversation.new_assistant_message(
                     sanitize(text)
                 ),
+                start_position=self.action_listener.detection_position,
+                trace=trace,
             )
             print("Done")
         except Exception as e:
@@ -44,6 +54,8 @@ class Assistant:
         finally:
             self.state = AssistantState.IDLE
             self.action_listener.resume()
+            trace.mark("listener_resumed")
+            trace_store.append(trace)
 
 
     async def start(self):
@@ -51,6 +63,7 @@ class Assistant:
             self.state = AssistantState.IDLE
             print("Assistant started. Listening for wakeword...")
             logger.log(AppMessage(content="Start listening for wakeword"))
+            self.microphone.start()
             await self.action_listener.start_listening()
         except Exception as e:
             logger.log(ErrorMessage(content=f"{self.__class__.__name__} : start: {e}"))
@@ -59,6 +72,7 @@ class Assistant:
     def stop(self):
         try:
             self.action_listener.stop_listening()
+            self.microphone.stop()
             self.state = AssistantState.OFF
         except Exception as e:
             logger.log(ErrorMessage(content=f"{self.__class__.__name__} : stop: {e}"))
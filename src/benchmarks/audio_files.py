@@ -0,0 +1,41 @@
+import wave
+from pathlib import Path
+from typing import Iterator, Union
+
+import numpy as np
+
+
+def load_audio(path: Union[str, Path], sample_rate: int = 16000, raw_sample_rate: int = 16000) -> np.ndarray:
+    """
+    Load a WAV file or raw PCM16 mono file (.pcm / .raw) as int16 samples at `sample_rate`.
+
+    Stereo WAV files are downmixed; other sample rates are resampled linearly.
+
+    Args:
+        path: Audio file.
+        sample_rate: Sample rate to return.
+        raw_sample_rate: Sample rate of raw PCM files, which have no header.
+    """
+    path = Path(path)
+    if path.suffix.lower() == ".wav":
+        with wave.open(str(path), "rb") as wav:
+            if wav.getsampwidth() != 2:
+                raise ValueError(f"{path}: only 16-bit WAV files are supported")
+            rate = wav.getframerate()
+            samples = np.frombuffer(wav.readframes(wav.getnframes()), dtype=np.int16)
+            if wav.getnchannels() > 1:
+                samples = samples.reshape(-1, wav.getnchannels()).mean(axis=1).astype(np.int16)
+    else:
+        rate = raw_sample_rate
+        samples = np.fromfile(path, dtype=np.int16)
+
+    if rate != sample_rate:
+        positions = np.arange(len(samples) * sample_rate // rate) * (rate / sample_rate)
+        samples = np.interp(positions, np.arange(len(samples)), samples).astype(np.int16)
+    return samples
+
+
+def iter_frames(samples: np.ndarray, frame_size: int) -> Iterator[np.ndarray]:
+    """Consecutive frames of `frame_size` samples; the last partial frame is dropped, as a live stream would."""
+    for start in range(0, len(samples) - frame_size + 1, frame_size):
+        yield samples[start:start + frame_size]
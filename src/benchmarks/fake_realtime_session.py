@@ -0,0 +1,294 @@
+"""
+Scripted stand-in for a realtime session, to run RealTimeEngine offline.
+
+A script is a list of ScriptedEvent: each one is emitted `delay` seconds after
+the previous one, as an object shaped like the openai-agents session events
+the engine reads (type, audio.data, tool, output, data, error...).
+ToolCall steps run the agent's tool for real, between tool_start and tool_end,
+like the SDK does. An Exception step is raised, as a dropped connection would.
+
+    factory = FakeSessionFactory(lambda: conversation_turn(response_seconds=3))
+    engine = RealTimeEngine(tools, audio_config, capture, session_factory=factory)
+"""
+import asyncio
+import json
+import threading
+import time
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from llm_engine.audio import MicrophoneCapture
+from llm_engine.models import AudioConfig
+
+
+@dataclass
+class ToolCall:
+    """Scripted tool call, dispatched to the agent's FunctionTool of that name."""
+
+    name: str
+    arguments: dict
+
+
+@dataclass
+class ScriptedEvent:
+    """One step of a script: an SDK-shaped event, a ToolCall or an Exception to raise."""
+
+    delay: float
+    event: Any
+
+
+def _event(type: str, **fields) -> SimpleNamespace:
+    return SimpleNamespace(type=type, **fields)
+
+
+def _raw_server_event(data: dict) -> SimpleNamespace:
+    return _event("raw_model_event", data=SimpleNamespace(type="raw_server_event", data=data))
+
+
+def agent_start(delay: float = 0.0, name: str = "Jarvis") -> List[ScriptedEvent]:
+    return [ScriptedEvent(delay, _event("agent_start", agent=SimpleNamespace(name=name)))]
+
+
+def speech_stopped(delay: float = 0.0) -> List[ScriptedEvent]:
+    """Server VAD end of speech."""
+    return [ScriptedEvent(delay, _raw_server_event({"type": "input_audio_buffer.speech_stopped"}))]
+
+
+def user_transcript(text: str, delay: float = 0.0) -> List[ScriptedEvent]:
+    return [ScriptedEvent(delay, _event("raw_model_event", data=SimpleNamespace(
+        type="conversation.item.input_audio_transcription.completed", transcript=text,
+    )))]
+
+
+def assistant_transcript(text: str, delay: float = 0.0) -> List[ScriptedEvent]:
+    return [ScriptedEvent(delay, _event("raw_model_event", data=SimpleNamespace(
+        type="response.audio_transcript.done", transcript=text,
+    )))]
+
+
+def audio_response(
+    seconds: float,
+    chunk_ms: int = 100,
+    speed: float = 4.0,
+    sample_rate: int = 24000,
+    delay: float = 0.0,
+) -> List[ScriptedEvent]:
+    """
+    PCM16 audio deltas of a response.
+
+    Args:
+        seconds: Duration of the response audio.
+        chunk_ms: Audio duration of each delta.
+        speed: Delivery rate relative to real time (the API usually sends faster than playback).
+        sample_rate: Output sample rate.
+        delay: Delay before the first delta.
+    """
+    samples = sample_rate * chunk_ms // 1000
+    t = np.arange(samples) / sample_rate
+    chunk = (np.sin(2 * np.pi * 220 * t) * 3000).astype(np.int16).tobytes()
+    count = max(1, int(seconds * 1000 / chunk_ms))
+    interval = chunk_ms / 1000 / speed
+    return [
+        ScriptedEvent(delay if i == 0 else interval, _event("audio", audio=SimpleNamespace(data=chunk)))
+        for i in range(count)
+    ]
+
+
+def audio_interrupted(delay: float = 0.0) -> List[ScriptedEvent]:
+    return [ScriptedEvent(delay, _event("audio_interrupted"))]
+
+
+def audio_end(delay: float = 0.0) -> List[ScriptedEvent]:
+    return [ScriptedEvent(delay, _event("audio_end"))]
+
+
+def tool_call(name: str, arguments: Optional[dict] = None, delay: float = 0.0) -> List[ScriptedEvent]:
+    return [ScriptedEvent(delay, ToolCall(name, arguments or {}))]
+
+
+def error(message: str, delay: float = 0.0) -> List[ScriptedEvent]:
+    return [ScriptedEvent(delay, _event("error", error=message))]
+
+
+def disconnect(message: str = "connection closed", delay: float = 0.0) -> List[ScriptedEvent]:
+    return [ScriptedEvent(delay, ConnectionError(message))]
+
+
+def conversation_turn(
+    speech_seconds: float = 2.0,
+    response_delay: float = 0.6,
+    response_seconds: float = 3.0,
+    chunk_ms: int = 100,
+    speed: float = 4.0,
+    tools: Optional[List[ToolCall]] = None,
+) -> List[ScriptedEvent]:
+    """The usual turn: user speaks, optional tool calls, spoken response, end."""
+    script = speech_stopped(delay=speech_seconds)
+    script += user_transcript("Quel temps fait-il demain ?", delay=0.2)
+    script += agent_start()
+    for call in tools or []:
+        script += [ScriptedEvent(0.1, call)]
+    script += audio_response(response_seconds, chunk_ms=chunk_ms, speed=speed, delay=response_delay)
+    script += assistant_transcript("Demain, il fera beau.")
+    script += audio_end()
+    return script
+
+
+class FakeRealtimeSession:
+    """
+    Replays a script as a realtime session: async context manager, async
+    iterator of events, and send_audio() for the uplink.
+
+    It also measures the engine: `handling` gets, per event type, the time
+    between handing an event over and being asked for the next one, i.e.
+    the engine's processing of that event.
+    """
+
+    def __init__(self, script: List[ScriptedEvent], agent=None, time_scale: float = 1.0):
+        """
+        Args:
+            script: Steps to replay.
+            agent: RealtimeAgent whose tools serve ToolCall steps.
+            time_scale: Multiplier applied to every delay (0 replays as fast as possible).
+        """
+        self._script = list(script)
+        self._pending: List[Any] = []
+        self._tools = {tool.name: tool for tool in getattr(agent, "tools", None) or []}
+        self._time_scale = time_scale
+        self._due = 0.0
+        self._handed_over: Optional[tuple] = None
+        self.handling: Dict[str, List[float]] = {}
+        self.tool_durations: Dict[str, List[float]] = {}
+        self.audio_packets = 0
+        self.audio_bytes = 0
+        self.events = 0
+
+    async def __aenter__(self):
+        self._due = time.monotonic()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+    async def send_audio(self, audio: bytes, *, commit: bool = False) -> None:
+        self.audio_packets += 1
+        self.audio_bytes += len(audio)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        now = time.monotonic()
+        if self._handed_over is not None:
+            event_type, handed_over_at = self._handed_over
+            self.handling.setdefault(event_type, []).append(now - handed_over_at)
+            self._handed_over = None
+
+        if not self._pending:
+            if not self._script:
+                raise StopAsyncIteration
+            step = self._script.pop(0)
+            # Delays are relative to the previous step, not to the engine being done with it
+            self._due += step.delay * self._time_scale
+            if self._due > now:
+                await asyncio.sleep(self._due - now)
+            if isinstance(step.event, Exception):
+                raise step.event
+            if isinstance(step.event, ToolCall):
+                await self._call_tool(step.event)
+            else:
+                self._pending.append(step.event)
+
+        event = self._pending.pop(0)
+        self.events += 1
+        self._handed_over = (event.type, time.monotonic())
+        return event
+
+    async def _call_tool(self, call: ToolCall) -> None:
+        """Queue tool_start, run the tool, queue tool_end with its output."""
+        tool = self._tools.get(call.name)
+        if tool is None:
+            self._pending.append(_event("error", error=f"unknown tool {call.name}"))
+            return
+        self._pending.append(_event("tool_start", tool=tool))
+        start = time.monotonic()
+        output = await tool.on_invoke_tool(None, json.dumps(call.arguments))
+        elapsed = time.monotonic() - start
+        self.tool_durations.setdefault(call.name, []).append(elapsed)
+        # Tool time is not the engine's: move the replay clock past it
+        self._due += elapsed
+        self._pending.append(_event("tool_end", tool=tool, output=output))
+
+
+class FakeSessionFactory:
+    """SessionFactory for RealTimeEngine handing out FakeRealtimeSession objects."""
+
+    def __init__(
+        self,
+        script: Callable[[], List[ScriptedEvent]],
+        connect_delay: float = 0.0,
+        time_scale: float = 1.0,
+    ):
+        """
+        Args:
+            script: Builds the script of each new session.
+            connect_delay: Simulated connection setup time, in seconds.
+            time_scale: Multiplier applied to every script delay.
+        """
+        self._script = script
+        self._connect_delay = connect_delay
+        self._time_scale = time_scale
+        self.sessions: List[FakeRealtimeSession] = []
+
+    async def __call__(self, agent, config: dict) -> FakeRealtimeSession:
+        if self._connect_delay:
+            await asyncio.sleep(self._connect_delay)
+        session = FakeRealtimeSession(self._script(), agent=agent, time_scale=self._time_scale)
+        self.sessions.append(session)
+        return session
+
+
+class _SilentInputStream:
+    """Stands in for sd.RawInputStream: calls the callback with silent blocks, paced in real time."""
+
+    def __init__(self, config: AudioConfig, callback):
+        self._block = bytes(config.input_chunk_size * config.input_channels * np.dtype(config.input_format).itemsize)
+        self._interval = config.input_chunk_size / config.input_sample_rate
+        self._callback = callback
+        self._running = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._running.set()
+        self._thread = threading.Thread(target=self._run, name="silent-microphone", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        next_block = time.monotonic()
+        while self._running.is_set():
+            next_block += self._interval
+            delay = next_block - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            self._callback(self._block, len(self._block), None, None)
+
+    def stop(self) -> None:
+        self._running.clear()
+        if self._thread is not None:
+            self._thread.join()
+
+    def close(self) -> None:
+        self._thread = None
+
+
+class SilentMicrophone(MicrophoneCapture):
+    """MicrophoneCapture fed with silence by a timer thread: no input device needed."""
+
+    def start(self) -> None:
+        if self._stream is not None:
+            return
+        self._stream = _SilentInputStream(self._config, self._audio_callback)
+        self._stream.start()
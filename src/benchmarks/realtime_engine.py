@@ -0,0 +1,250 @@
+"""
+Run RealTimeEngine against scripted fake sessions, headless, and report its overhead.
+
+Run from src/:
+
+    python -m benchmarks.realtime_engine
+    python -m benchmarks.realtime_engine --scenario tools --turns 5 --speed 1 4 20 --json report.json
+
+No network, microphone or speaker is used: the session is a FakeRealtimeSession,
+the microphone a SilentMicrophone and playback the "null" output backend.
+Reported per scenario and delivery speed:
+  - event-loop lag: how late a 5 ms asyncio.sleep wakes up while the engine runs
+  - handling: time the engine spends on each event before asking for the next one
+  - the turn's trace marks (first audio, first sample played, last sample played...)
+
+The agent's prompt is rendered from the age, boyfriend_name, city and
+family_city variables: values from the environment or .env are used,
+placeholders otherwise. The run exits with status 1 when a scenario
+completed no turn (no audio received) or logged an error it did not
+script (e.g. a missing ffmpeg to decode the chime): its report then
+measured nothing meaningful.
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from typing import Callable, Dict, List
+
+import numpy as np
+from dotenv import load_dotenv
+
+from benchmarks.fake_realtime_session import (
+    FakeSessionFactory,
+    ScriptedEvent,
+    SilentMicrophone,
+    ToolCall,
+    audio_end,
+    audio_interrupted,
+    audio_response,
+    conversation_turn,
+    disconnect,
+    error,
+)
+from llm_engine.models import AudioConfig
+from llm_engine.real_time_engine import RealTimeEngine
+from logger import logger
+from models.tools import ToolParameter
+from tools.tool import Tool
+from tracing import TurnTrace
+
+# The agent's prompt is rendered from the .env values
+load_dotenv()
+PROMPT_DEFAULTS = {"age": "30", "boyfriend_name": "Alex", "city": "Paris", "family_city": "Lyon"}
+for variable, value in PROMPT_DEFAULTS.items():
+    os.environ.setdefault(variable, value)
+
+LAG_INTERVAL = 0.005
+# Errors a scenario provokes on purpose (start of the logged message)
+EXPECTED_ERRORS = {
+    "error": ("SDK realtime error",),
+    "disconnect": ("RealTimeEngine : start: connection closed",),
+}
+
+
+class SleepTool(Tool):
+    """Tool doing nothing for a given time, in a worker thread like the real ones."""
+
+    def __init__(self, seconds: float):
+        self._seconds = seconds
+
+    @property
+    def tool_name(self) -> str:
+        return "sleep"
+
+    @property
+    def description(self) -> str:
+        return "Wait a bit."
+
+    @property
+    def parameters(self) -> list[ToolParameter]:
+        return []
+
+    def execute(self, **kwargs):
+        time.sleep(self._seconds)
+        return "done"
+
+
+def scenarios(args, speed: float) -> Dict[str, Callable[[], List[ScriptedEvent]]]:
+    audio = dict(chunk_ms=args.chunk_ms, speed=speed)
+    return {
+        "turn": lambda: conversation_turn(response_seconds=args.response_seconds, **audio),
+        "tools": lambda: conversation_turn(
+            response_seconds=args.response_seconds,
+            tools=[ToolCall("sleep", {}), ToolCall("sleep", {})],
+            **audio,
+        ),
+        "interrupt": lambda: (
+            audio_response(args.response_seconds, delay=0.5, **audio)
+            + audio_interrupted()
+            + audio_response(args.response_seconds, delay=0.3, **audio)
+            + audio_end()
+        ),
+        "error": lambda: (
+            error("rate limit reached", delay=0.5)
+            + audio_response(args.response_seconds, delay=0.2, **audio)
+            + audio_end()
+        ),
+        "disconnect": lambda: audio_response(args.response_seconds / 2, delay=0.5, **audio) + disconnect(),
+    }
+
+
+def percentiles_ms(values: List[float]) -> dict:
+    values_ms = np.array(values) * 1000 if values else np.zeros(1)
+    return {
+        "count": len(values),
+        "p50": round(float(np.percentile(values_ms, 50)), 3),
+        "p95": round(float(np.percentile(values_ms, 95)), 3),
+        "p99": round(float(np.percentile(values_ms, 99)), 3),
+        "max": round(float(values_ms.max()), 3),
+    }
+
+
+async def monitor_loop_lag(lags: List[float]) -> None:
+    """Collect how late each LAG_INTERVAL sleep wakes up."""
+    while True:
+        start = time.perf_counter()
+        await asyncio.sleep(LAG_INTERVAL)
+        lags.append(time.perf_counter() - start - LAG_INTERVAL)
+
+
+async def run(args, name: str, script: Callable[[], List[ScriptedEvent]]) -> dict:
+    logger.flush()
+    first_log = logger.next_cursor
+    audio_config = AudioConfig(output_backend="null")
+    microphone = SilentMicrophone(audio_config)
+    factory = FakeSessionFactory(script, connect_delay=args.connect_ms / 1000, time_scale=args.time_scale)
+    engine = RealTimeEngine(
+        [SleepTool(args.tool_ms / 1000)], audio_config, microphone, session_factory=factory,
+    )
+    microphone.start()
+
+    lags: List[float] = []
+    monitor = asyncio.create_task(monitor_loop_lag(lags))
+    traces = []
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    try:
+        for _ in range(args.turns):
+            trace = TurnTrace()
+            await engine.start(start_position=microphone.position, trace=trace)
+            traces.append(trace.to_record()["marks"])
+    finally:
+        monitor.cancel()
+        microphone.stop()
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+    logger.flush()
+    errors = [
+        record["content"]
+        for record in logger.query(cursor=first_log, roles=["error"], limit=1000).records
+        if not record["content"].startswith(EXPECTED_ERRORS.get(name, ()))
+    ]
+
+    handling: Dict[str, List[float]] = {}
+    for session in factory.sessions:
+        for event_type, durations in session.handling.items():
+            handling.setdefault(event_type, []).extend(durations)
+    all_handling = [d for durations in handling.values() for d in durations]
+    marks = {}
+    for mark in sorted({m for trace in traces for m in trace}):
+        marks[mark] = round(float(np.mean([trace[mark] for trace in traces if mark in trace])), 1)
+    return {
+        "scenario": name,
+        "turns": args.turns,
+        "completed_turns": sum("first_audio" in trace for trace in traces),
+        "errors": errors,
+        "wall_seconds": round(wall, 3),
+        "cpu_seconds": round(cpu, 3),
+        "events": sum(session.events for session in factory.sessions),
+        "uplink_packets": sum(session.audio_packets for session in factory.sessions),
+        "loop_lag_ms": percentiles_ms(lags),
+        "handling_ms": percentiles_ms(all_handling),
+        "handling_by_event_ms": {event_type: percentiles_ms(d) for event_type, d in handling.items()},
+        "mean_marks_ms": marks,
+    }
+
+
+def print_report(report: dict) -> None:
+    lag = report["loop_lag_ms"]
+    handling = report["handling_ms"]
+    print(f"== {report['scenario']} (speed x{report['speed']})")
+    print(f"turns           {report['completed_turns']}/{report['turns']} in {report['wall_seconds']:.2f}s, cpu {report['cpu_seconds']:.2f}s, "
+          f"{report['events']} events, {report['uplink_packets']} uplink packets")
+    print(f"loop lag        p50 {lag['p50']:.2f}ms  p95 {lag['p95']:.2f}ms  p99 {lag['p99']:.2f}ms  max {lag['max']:.2f}ms")
+    print(f"handling        p50 {handling['p50']:.3f}ms  p95 {handling['p95']:.3f}ms  max {handling['max']:.3f}ms")
+    for event_type, stats in sorted(report["handling_by_event_ms"].items()):
+        print(f"  {event_type:18} n={stats['count']:<5} p50 {stats['p50']:.3f}ms  p95 {stats['p95']:.3f}ms  max {stats['max']:.3f}ms")
+    marks = ", ".join(f"{mark} {at:.0f}" for mark, at in sorted(report["mean_marks_ms"].items(), key=lambda m: m[1]))
+    print(f"marks (mean ms) {marks}")
+    for error in report["errors"]:
+        print(f"ERROR           {error}")
+
+
+def failure(report: dict) -> str:
+    """Why the report does not measure a working engine ("" if it does)."""
+    if report["completed_turns"] == 0:
+        return "no turn completed"
+    if report["errors"]:
+        return f"{len(report['errors'])} unexpected errors logged"
+    return ""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenario", nargs="+", default=["turn", "tools", "interrupt", "error", "disconnect"])
+    parser.add_argument("--turns", type=int, default=3)
+    parser.add_argument("--speed", nargs="+", type=float, default=[4.0], help="Audio delivery rate vs real time")
+    parser.add_argument("--chunk-ms", type=int, default=100, help="Audio duration of each delta")
+    parser.add_argument("--response-seconds", type=float, default=2.0)
+    parser.add_argument("--connect-ms", type=float, default=0.0, help="Simulated connection time")
+    parser.add_argument("--tool-ms", type=float, default=200.0, help="Duration of the scripted tool calls")
+    parser.add_argument("--time-scale", type=float, default=1.0, help="Multiplier of every scripted delay")
+    parser.add_argument("--json", help="Also write the reports to this file")
+    args = parser.parse_args()
+
+    reports = []
+    for speed in args.speed:
+        available = scenarios(args, speed)
+        for name in args.scenario:
+            if name not in available:
+                parser.error(f"unknown scenario {name} (choose from {', '.join(available)})")
+            report = asyncio.run(run(args, name, available[name]))
+            report["speed"] = speed
+            print_report(report)
+            reports.append(report)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(reports, f, indent=2)
+
+    failures = [f"{r['scenario']} x{r['speed']}: {failure(r)}" for r in reports if failure(r)]
+    if failures:
+        print("FAILED: " + "; ".join(failures), file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Offline check of the wake word energy gate: same audio, with and without the gate.
+
+Run from src/:
+
+    python -m benchmarks.wake_word_gate --positive hey_jarvis_*.wav --negative kitchen_noise.wav
+
+Files are read as the listener reads the microphone: converted to the
+capture rate (--capture-rate, 24 kHz by default) and resampled to 16 kHz in
+80 ms blocks. Positive files should each contain the wake word, negative
+files should not. Recall and false detections must match between the two
+runs; duty cycle and inference CPU show what the gate saves.
+"""
+import argparse
+import time
+from typing import List, Optional
+
+from actions_listener.energy_gate import EnergyGate
+from actions_listener.wake_word_config import WakeWordConfig
+from actions_listener.wake_word_listener import capture_resampler
+from actions_listener.wake_word_pipeline import WakeWordPipeline
+from benchmarks.audio_files import iter_frames, load_audio
+from llm_engine.models import AudioConfig
+
+
+def run(files: List[str], gate: Optional[EnergyGate], capture_rate: int) -> dict:
+    pipeline = WakeWordPipeline(WakeWordConfig(use_energy_gate=gate is not None), gate)
+    detections = {}
+    start = time.process_time()
+    for path in files:
+        pipeline.reset()
+        resampler = capture_resampler(capture_rate)
+        samples = load_audio(path, capture_rate)
+        detections[path] = sum(
+            pipeline.process(resampler.process(block)) is not None
+            for block in iter_frames(samples, resampler.block_size)
+        )
+    return {
+        "detections": detections,
+        "duty_cycle": pipeline.duty_cycle,
+        "inference_cpu": pipeline.inference_time,
+        "total_cpu": time.process_time() - start,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--positive", nargs="*", default=[], help="Files containing the wake word")
+    parser.add_argument("--negative", nargs="*", default=[], help="Files without the wake word")
+    parser.add_argument("--margin-db", type=float, default=10.0)
+    parser.add_argument("--hangover-frames", type=int, default=25)
+    parser.add_argument("--context-frames", type=int, default=12)
+    parser.add_argument("--capture-rate", type=int, default=AudioConfig().input_sample_rate)
+    args = parser.parse_args()
+    files = args.positive + args.negative
+    if not files:
+        parser.error("give at least one --positive or --negative file")
+
+    results = {
+        "ungated": run(files, None, args.capture_rate),
+        "gated": run(files, EnergyGate(
+            margin_db=args.margin_db,
+            hangover_frames=args.hangover_frames,
+            context_frames=args.context_frames,
+        ), args.capture_rate),
+    }
+
+    print(f"{'':10} {'recall':>8} {'false det.':>10} {'duty':>7} {'infer cpu':>10} {'total cpu':>10}")
+    for name, result in results.items():
+        recall = sum(result["detections"][f] > 0 for f in args.positive) / len(args.positive) if args.positive else float("nan")
+        false_detections = sum(result["detections"][f] for f in args.negative)
+        print(
+            f"{name:10} {recall:>8.1%} {false_detections:>10} {result['duty_cycle']:>7.1%} "
+            f"{result['inference_cpu']:>9.2f}s {result['total_cpu']:>9.2f}s"
+        )
+
+    missed = [f for f in args.positive if results["ungated"]["detections"][f] and not results["gated"]["detections"][f]]
+    for path in missed:
+        print(f"missed with the gate: {path}")
+
+
+if __name__ == "__main__":
+    main()
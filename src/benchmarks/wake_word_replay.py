@@ -0,0 +1,192 @@
+"""
+Replay audio files through the wake word pipeline, headless, and report speed and accuracy.
+
+Run from src/:
+
+    python -m benchmarks.wake_word_replay hey_jarvis_*.wav --negative radio_1h.wav
+    python -m benchmarks.wake_word_replay hey_jarvis_*.wav --framework tflite onnx --ncpu 1 2 4
+    python -m benchmarks.wake_word_replay hey_jarvis_*.wav --capture-rate 16000
+
+Files are converted to the microphone's capture rate (24 kHz by default) and
+read as the listener reads them: 80 ms blocks through its resampler down to
+16 kHz, then the same WakeWordPipeline (model, verifier, energy gate,
+detector), as fast as possible. --capture-rate 16000 feeds 16 kHz frames
+straight to the pipeline. Detections in --negative files count as false accepts.
+Several --framework / --ncpu values run every combination, one after the
+other in this process (peak RSS is then the maximum so far).
+"""
+import argparse
+import itertools
+import json
+import sys
+import time
+from typing import List, Optional
+
+import numpy as np
+
+from actions_listener.wake_word_config import WakeWordConfig
+from actions_listener.wake_word_listener import capture_resampler
+from actions_listener.wake_word_pipeline import WakeWordPipeline
+from actions_listener.wake_word_thresholds import WakeWordThresholds
+from benchmarks.audio_files import iter_frames, load_audio
+from llm_engine.models import AudioConfig
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process, in MB."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Bytes on macOS, KiB on Linux
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def replay(pipeline: WakeWordPipeline, path: str, latencies: List[float], capture_rate: int) -> dict:
+    """
+    Stream one file through the resampler and the pipeline.
+
+    Appends each frame's processing time (s), resampling included, to `latencies`.
+    """
+    pipeline.reset()
+    resampler = capture_resampler(capture_rate)
+    samples = load_audio(path, capture_rate)
+    detections = []
+    for index, block in enumerate(iter_frames(samples, resampler.block_size)):
+        start = time.perf_counter()
+        detection = pipeline.process(resampler.process(block))
+        latencies.append(time.perf_counter() - start)
+        if detection is not None:
+            detections.append({
+                "time": (index + 1) * WakeWordPipeline.FRAME_SIZE / WakeWordPipeline.SAMPLE_RATE,
+                "model": detection.model,
+                "score": round(detection.score, 3),
+            })
+    return {
+        "file": path,
+        "duration": len(samples) / capture_rate,
+        "detections": detections,
+    }
+
+
+def run(args, pipeline: WakeWordPipeline) -> dict:
+    latencies: List[float] = []
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    positives = [replay(pipeline, path, latencies, args.capture_rate) for path in args.files]
+    negatives = [replay(pipeline, path, latencies, args.capture_rate) for path in args.negative]
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+
+    audio = sum(result["duration"] for result in positives + negatives)
+    negative_hours = sum(result["duration"] for result in negatives) / 3600
+    false_accepts = sum(len(result["detections"]) for result in negatives)
+    latencies_ms = np.array(latencies) * 1000 if latencies else np.zeros(1)
+    return {
+        "audio_seconds": round(audio, 1),
+        "wall_seconds": round(wall, 3),
+        "real_time_factor": round(wall / audio, 4) if audio else None,
+        "cpu_seconds": round(cpu, 3),
+        "frame_latency_ms": {
+            "p50": round(float(np.percentile(latencies_ms, 50)), 3),
+            "p95": round(float(np.percentile(latencies_ms, 95)), 3),
+            "p99": round(float(np.percentile(latencies_ms, 99)), 3),
+            "max": round(float(latencies_ms.max()), 3),
+        },
+        "duty_cycle": round(pipeline.duty_cycle, 3),
+        "peak_rss_mb": peak_rss_mb(),
+        "recall": (
+            sum(bool(result["detections"]) for result in positives) / len(positives) if positives else None
+        ),
+        "false_accepts": false_accepts,
+        "false_accepts_per_hour": round(false_accepts / negative_hours, 2) if negative_hours else None,
+        "files": positives + negatives,
+    }
+
+
+def print_report(report: dict) -> None:
+    latency = report["frame_latency_ms"]
+    print(f"== {report['config']}")
+    print(f"audio           {report['audio_seconds']:.1f}s in {report['wall_seconds']:.2f}s "
+          f"(RTF {report['real_time_factor']}), cpu {report['cpu_seconds']:.2f}s")
+    print(f"load            {report['load_seconds']:.2f}s")
+    print(f"frame latency   p50 {latency['p50']:.2f}ms  p95 {latency['p95']:.2f}ms  "
+          f"p99 {latency['p99']:.2f}ms  max {latency['max']:.2f}ms")
+    print(f"duty cycle      {report['duty_cycle']:.1%}")
+    print(f"peak RSS        {report['peak_rss_mb']:.0f} MB" if report["peak_rss_mb"] else "peak RSS        n/a")
+    if report["recall"] is not None:
+        print(f"recall          {report['recall']:.1%}")
+    if report["false_accepts_per_hour"] is not None:
+        print(f"false accepts   {report['false_accepts']} ({report['false_accepts_per_hour']}/h)")
+    for result in report["files"]:
+        times = ", ".join(f"{d['time']:.2f}s ({d['score']})" for d in result["detections"]) or "-"
+        print(f"  {result['file']} [{result['duration']:.1f}s]: {times}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("files", nargs="*", help="Files expected to contain the wake word")
+    parser.add_argument("--negative", nargs="*", default=[], help="Files without the wake word (false accepts)")
+    parser.add_argument("--no-gate", action="store_true", help="Run the model on every frame")
+    parser.add_argument(
+        "--capture-rate", type=int, default=AudioConfig().input_sample_rate,
+        help="Microphone sample rate the files are converted to before the listener's resampler",
+    )
+    parser.add_argument("--framework", nargs="+", default=["tflite"], choices=["tflite", "onnx"])
+    parser.add_argument("--ncpu", nargs="+", type=int, default=[1], help="Feature model threads")
+    parser.add_argument("--model", help="Wake word model (e.g. a quantized export); default per framework")
+    parser.add_argument("--melspec-model", default="", help="Melspectrogram model; default: openWakeWord's")
+    parser.add_argument("--embedding-model", default="", help="Embedding model; default: openWakeWord's")
+    parser.add_argument("--trigger-score", type=float, default=WakeWordThresholds.trigger_score)
+    parser.add_argument("--trigger-average", type=float, default=WakeWordThresholds.trigger_average)
+    parser.add_argument("--release-score", type=float, default=WakeWordThresholds.release_score)
+    parser.add_argument("--json", help="Also write the report(s) to this file")
+    args = parser.parse_args()
+    if not args.files and not args.negative:
+        parser.error("give at least one file")
+
+    reports = []
+    for framework, ncpu in itertools.product(args.framework, args.ncpu):
+        config = WakeWordConfig(
+            inference_framework=framework,
+            ncpu=ncpu,
+            model_path=args.model,
+            melspec_model_path=args.melspec_model,
+            embedding_model_path=args.embedding_model,
+            use_energy_gate=not args.no_gate,
+            thresholds=WakeWordThresholds(
+                trigger_score=args.trigger_score,
+                trigger_average=args.trigger_average,
+                release_score=args.release_score,
+            ),
+        )
+        load_start = time.perf_counter()
+        pipeline = WakeWordPipeline(config)
+        load_seconds = time.perf_counter() - load_start
+
+        report = run(args, pipeline)
+        report["config"] = f"{config.describe()}, capture={args.capture_rate}Hz"
+        report["load_seconds"] = round(load_seconds, 3)
+        print_report(report)
+        reports.append(report)
+
+    if len(reports) > 1:
+        print(f"\n{'config':48} {'RTF':>8} {'p95 ms':>8} {'cpu s':>8} {'recall':>7} {'FA/h':>6}")
+        for report in reports:
+            recall = f"{report['recall']:.0%}" if report["recall"] is not None else "-"
+            false_accepts = report["false_accepts_per_hour"] if report["false_accepts_per_hour"] is not None else "-"
+            print(
+                f"{report['config']:48} {report['real_time_factor']:>8} {report['frame_latency_ms']['p95']:>8} "
+                f"{report['cpu_seconds']:>8} {recall:>7} {false_accepts:>6}"
+            )
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(reports if len(reports) > 1 else reports[0], f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
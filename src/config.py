@@ -5,7 +5,37 @@ SRC_DIR = Path(__file__).parent
 
 
 class Config:
-    LOGS_FILE = PROJECT_ROOT / "logs.json"
+    LOGS_FILE = PROJECT_ROOT / "logs.jsonl"
+    LEGACY_LOGS_FILE = PROJECT_ROOT / "logs.json"
+    # "never": leave flushing to the OS, "interval": fsync at most every LOGS_FSYNC_INTERVAL seconds,
+    # "always": fsync after every record (safest, slowest on an SD card)
+    LOGS_FSYNC_POLICY = "interval"
+    LOGS_FSYNC_INTERVAL = 5.0
+    # The active log segment is sealed (gzip) past this size or once its first record is older than this age;
+    # sealed segments past the retention count or age are deleted
+    LOGS_MAX_SEGMENT_SIZE = 2 * 1024 * 1024
+    LOGS_MAX_SEGMENT_AGE = 24 * 3600
+    LOGS_RETENTION_SEGMENTS = 30
+    LOGS_RETENTION_AGE = 14 * 24 * 3600
+    # Records waiting for the background writer; past this, LOGS_OVERFLOW_POLICY decides which ones are dropped
+    LOGS_QUEUE_SIZE = 10000
+    LOGS_OVERFLOW_POLICY = "drop_oldest"
+    LOGS_FOLLOW_POLL_INTERVAL = 0.5
+    # One line per voice turn with its latency marks; the last TRACES_KEEP turns are kept in memory for /traces
+    TRACES_FILE = PROJECT_ROOT / "traces.jsonl"
+    TRACES_KEEP = 500
+    # traces.jsonl is moved to traces.jsonl.1 (replacing it) past this size
+    TRACES_MAX_FILE_SIZE = 2 * 1024 * 1024
     TOKEN_FILE = PROJECT_ROOT / "secret_token.json"
+    # Microsoft To Do lists (name -> id) are refetched after TODO_LISTS_TTL seconds or on a 404;
+    # persisted in TODO_LISTS_CACHE_FILE across restarts (None: memory only)
+    TODO_LISTS_TTL = 24 * 3600
+    TODO_LISTS_CACHE_FILE = PROJECT_ROOT / "todo_lists_cache.json"
+    # City -> coordinates, kept forever; forecasts are kept WEATHER_FORECAST_TTL seconds (LRU beyond the size)
+    WEATHER_GEOCODE_CACHE_FILE = PROJECT_ROOT / "geocode_cache.json"
+    WEATHER_FORECAST_CACHE_SIZE = 64
+    WEATHER_FORECAST_TTL = 30 * 60
+    # Offline city coordinates (name, latitude, longitude[, population] columns), e.g. a French communes CSV
+    WEATHER_GAZETTEER_FILE = SRC_DIR / "tools" / "weather" / "data" / "french_cities.csv"
     NOTIFICATION_SOUND = SRC_DIR / "listening.mp3"
     WORKDIR = PROJECT_ROOT / "workdir"
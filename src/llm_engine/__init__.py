@@ -1,3 +1,3 @@
-from .real_time_engine import RealTimeEngine
+from .real_time_engine import RealTimeEngine, SessionFactory
 
-__all__ = ["RealTimeEngine"]
+__all__ = ["RealTimeEngine", "SessionFactory"]
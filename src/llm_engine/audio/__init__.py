@@ -1,4 +1,25 @@
 from .audio_player import AudioPlayer
 from .audio_recorder import AudioRecorder
+from .stream_audio_player import StreamAudioPlayer
+from .null_audio_player import NullAudioPlayer
+from .player_factory import create_audio_player
+from .uplink_sender import UplinkSender
+from .notification_chime import NotificationChime
+from .sample_ring_buffer import SampleRingBuffer
+from .microphone_capture import MicrophoneCapture
+from .microphone_reader import MicrophoneReader
+from .polyphase_resampler import PolyphaseResampler
 
-__all__ = ["AudioPlayer", "AudioRecorder"]
+__all__ = [
+    "AudioPlayer",
+    "AudioRecorder",
+    "StreamAudioPlayer",
+    "NullAudioPlayer",
+    "create_audio_player",
+    "UplinkSender",
+    "NotificationChime",
+    "SampleRingBuffer",
+    "MicrophoneCapture",
+    "MicrophoneReader",
+    "PolyphaseResampler",
+]
@@ -1,15 +1,24 @@
 import asyncio
 import base64
 import subprocess
+import threading
 import time
-from typing import Optional
+from typing import Callable, Optional
 
 from llm_engine.models import AudioConfig
-from logger import logger, ErrorMessage
+from logger import logger, AppMessage, ErrorMessage
+from .pcm_ring_buffer import PcmRingBuffer
 
 
 class AudioPlayer:
-    """Handles audio playback using ffplay subprocess."""
+    """
+    Handles audio playback using ffplay subprocess.
+
+    Incoming audio is copied into a PcmRingBuffer; a pump thread is the only
+    one writing to ffplay's stdin, so a full pipe never blocks the event loop.
+    """
+
+    PUMP_CHUNK_SIZE = 4800  # 100 ms at 24 kHz PCM16
 
     def __init__(self, config: AudioConfig):
         self._config = config
@@ -17,6 +26,20 @@ class AudioPlayer:
         self._is_first_chunk = True
         self._stream_start_time: Optional[float] = None
         self._total_audio_duration: float = 0
+        # Wall-clock time the last queued sample finishes playing
+        self._play_end = 0.0
+        self._ring = PcmRingBuffer(
+            config.playback_buffer_bytes,
+            prebuffer_bytes=config.playback_prebuffer_bytes,
+            frame_size=config.bytes_per_sample,
+        )
+        self._data_ready = threading.Event()
+        self._pump_thread: Optional[threading.Thread] = None
+        self._pump_running = False
+        self._reported_overruns = 0
+        # Called from the pump thread when audio is handed to ffplay after silence
+        # (ffplay's own buffering comes on top of that time)
+        self.on_playback_start: Optional[Callable[[float], None]] = None
 
     @property
     def is_playing(self) -> bool:
@@ -28,16 +51,24 @@ class AudioPlayer:
         """Estimated remaining playback duration in seconds."""
         if not self._stream_start_time:
             return 0
-        time_elapsed = time.time() - self._stream_start_time
-        return max(0, self._total_audio_duration - time_elapsed)
+        return max(0, self._play_end - time.time())
+
+    @property
+    def underruns(self) -> int:
+        """Always 0: ffplay buffers on its own side of the pipe, starvation is not observable here."""
+        return self._ring.underruns
+
+    @property
+    def overruns(self) -> int:
+        """Number of chunks that did not fit in the jitter buffer."""
+        return self._ring.overruns
 
     async def stream_bytes(self, raw_bytes: bytes) -> None:
-        """Stream raw PCM bytes to the player (no base64 decoding needed)."""
+        """Queue raw PCM bytes for playback (no base64 decoding needed). Only copies into the ring buffer."""
         try:
             chunk_samples = len(raw_bytes) // self._config.bytes_per_sample
             chunk_duration = chunk_samples / self._config.output_sample_rate
             self._total_audio_duration += chunk_duration
-            print(f"[AudioPlayer] stream_bytes: {len(raw_bytes)} bytes ({chunk_duration:.3f}s), total={self._total_audio_duration:.3f}s")
 
             if self._is_first_chunk:
                 await self.cleanup()
@@ -46,34 +77,18 @@ class AudioPlayer:
                 self._stream_start_time = time.time()
                 self._is_first_chunk = False
 
-            if self._process and self._process.stdin and self._process.poll() is None:
-                loop = asyncio.get_event_loop()
-                process = self._process
-                try:
-                    await asyncio.wait_for(
-                        loop.run_in_executor(
-                            None,
-                            lambda: (process.stdin.write(raw_bytes), process.stdin.flush()),
-                        ),
-                        timeout=5.0,
-                    )
-                except asyncio.TimeoutError:
-                    pid = self._process.pid if self._process else "None"
-                    print(
-                        f"[AudioPlayer] FREEZE DETECTED: stdin.write blocked >5s "
-                        f"(pid={pid}, pipe buffer likely full — ffplay may be stuck)"
-                    )
-                    logger.log(ErrorMessage(content=f"AudioPlayer stdin write timeout (pid={pid}): ffplay deadlocked, killing process"))
-                    await self.cleanup()
+            # Audio queued after a gap (the chime, then the response) plays from when it arrives:
+            # ffplay waits for the pipe, the silence in between is not playback time
+            self._play_end = max(self._play_end, time.time()) + chunk_duration
+
+            if self._process and self._process.poll() is None:
+                self._ring.write(raw_bytes)
+                self._data_ready.set()
             else:
                 poll = self._process.poll() if self._process else "None"
                 print(f"[AudioPlayer] process dead or unavailable (poll={poll})")
                 await self.cleanup()
 
-        except BrokenPipeError:
-            pid = self._process.pid if self._process else "None"
-            print(f"[AudioPlayer] BrokenPipeError (pid={pid}) — ffplay stdin closed unexpectedly")
-            await self.cleanup()
         except Exception as e:
             print(f"[AudioPlayer] Error streaming audio bytes: {type(e).__name__}: {e}")
             logger.log(ErrorMessage(content=f"AudioPlayer stream_bytes: {type(e).__name__}: {e}"))
@@ -81,37 +96,10 @@ class AudioPlayer:
 
     async def stream_chunk(self, audio_base64: str) -> None:
         """Stream a base64-encoded audio chunk to the player."""
-        try:
-            decoded_data = base64.b64decode(audio_base64)
-
-            # Calculate duration of this chunk
-            chunk_samples = len(decoded_data) // self._config.bytes_per_sample
-            chunk_duration = chunk_samples / self._config.output_sample_rate
-            self._total_audio_duration += chunk_duration
-
-            if self._is_first_chunk:
-                await self.cleanup()
-                self._start_player()
-                self._stream_start_time = time.time()
-                self._is_first_chunk = False
-
-            if self._process and self._process.stdin:
-                if self._process.poll() is None:
-                    self._process.stdin.write(decoded_data)
-                    self._process.stdin.flush()
-                else:
-                    print("Player process has terminated unexpectedly")
-                    await self.cleanup()
-
-        except BrokenPipeError:
-            print("Broken pipe - player process may have terminated")
-            await self.cleanup()
-        except Exception as e:
-            print(f"Error streaming audio: {e}")
-            await self.cleanup()
+        await self.stream_bytes(base64.b64decode(audio_base64))
 
     def _start_player(self) -> None:
-        """Start ffplay process."""
+        """Start ffplay process and the thread feeding it."""
         self._process = subprocess.Popen(
             [
                 "ffplay",
@@ -135,9 +123,47 @@ class AudioPlayer:
             stderr=subprocess.DEVNULL,
             bufsize=0,
         )
+        self._pump_running = True
+        self._pump_thread = threading.Thread(
+            target=self._pump, args=(self._process,), name="ffplay-pump", daemon=True
+        )
+        self._pump_thread.start()
+
+    def _pump(self, process: subprocess.Popen) -> None:
+        """Single consumer of the ring buffer: moves queued audio into ffplay's stdin."""
+        chunk = bytearray(self.PUMP_CHUNK_SIZE)
+        view = memoryview(chunk)
+        emitting = False
+        while self._pump_running:
+            # Only ask for what is queued: a partial read is not an underrun here
+            size = self._ring.read_into(view[:min(len(chunk), self._ring.available)])
+            if size == 0:
+                if not self._data_ready.wait(0.05):
+                    emitting = False
+                self._data_ready.clear()
+                continue
+            if not emitting and self.on_playback_start:
+                self.on_playback_start(time.monotonic())
+            emitting = True
+            try:
+                written = 0
+                while written < size:
+                    written += process.stdin.write(view[written:size])
+            except (BrokenPipeError, OSError, ValueError) as e:
+                print(f"[AudioPlayer] pump stopped (pid={process.pid}): {type(e).__name__}: {e}")
+                break
+
+    def end_of_stream(self) -> None:
+        """No more audio is coming for now: flush the jitter buffer to ffplay."""
+        self._ring.end_of_stream()
+        self._data_ready.set()
 
     async def wait_for_completion(self) -> None:
         """Wait for current audio to finish playing."""
+        self.end_of_stream()
+        while self._ring.available > 0 and self.is_playing:
+            await asyncio.sleep(0.02)
+
         if self._process and self._process.poll() is None:
             remaining = self.remaining_duration + 1  # Add buffer
             print(
@@ -150,8 +176,12 @@ class AudioPlayer:
 
     async def cleanup(self) -> None:
         """Clean up player process."""
+        self._ring.clear()
+        self._report_buffer_stats()
         if self._process:
             pid = self._process.pid
+            self._pump_running = False
+            self._data_ready.set()
             try:
                 if self._process.stdin:
                     try:
@@ -169,10 +199,22 @@ class AudioPlayer:
                 except asyncio.TimeoutError:
                     print(f"[AudioPlayer] cleanup: ffplay (pid={pid}) didn't exit in 2s, killing")
                     self._process.kill()
+                if self._pump_thread:
+                    await loop.run_in_executor(None, self._pump_thread.join, 1.0)
             except Exception as e:
                 print(f"[AudioPlayer] cleanup error (pid={pid}): {type(e).__name__}: {e}")
             finally:
                 self._process = None
+                self._pump_thread = None
                 self._is_first_chunk = True
                 self._stream_start_time = None
                 self._total_audio_duration = 0
+                self._play_end = 0.0
+
+    def _report_buffer_stats(self) -> None:
+        if self._ring.overruns != self._reported_overruns:
+            logger.log(AppMessage(
+                content=f"{self.__class__.__name__}: jitter buffer overruns={self._ring.overruns} "
+                        f"(dropped {self._ring.dropped_bytes} bytes)"
+            ))
+            self._reported_overruns = self._ring.overruns
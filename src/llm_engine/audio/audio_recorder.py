@@ -1,62 +1,99 @@
 import asyncio
 import base64
 import time
-from typing import Callable, Optional
+from typing import TYPE_CHECKING, Callable, Optional
 
-import sounddevice as sd
+import numpy as np
 
 from llm_engine.models import AudioConfig
 from logger import logger, AppMessage, ErrorMessage
+from .microphone_capture import MicrophoneCapture
+
+if TYPE_CHECKING:
+    import sounddevice as sd
 
 
 class AudioRecorder:
-    """Handles microphone input recording using sounddevice."""
+    """
+    Handles microphone input recording using sounddevice.
+
+    Each block is copied once, out of PortAudio's buffer, into a slot of a
+    preallocated pool and handed to `on_raw_audio` as a memoryview of that
+    slot. Slots are reused round-robin: a consumer that keeps a block for
+    longer than `input_block_pool_size` blocks must copy it (``bytes(block)``).
+
+    Given a MicrophoneCapture, it subscribes to the shared always-on stream
+    instead of opening its own, and can start from an earlier position.
+    """
 
     def __init__(
         self,
         config: AudioConfig,
-        on_audio_data: Callable[[str], None],
+        on_audio_data: Optional[Callable[[str], None]] = None,
+        on_raw_audio: Optional[Callable[[memoryview], None]] = None,
+        capture: Optional[MicrophoneCapture] = None,
     ):
         """
         Initialize the audio recorder.
 
         Args:
             config: Audio configuration settings.
-            on_audio_data: Callback receiving base64-encoded audio chunks.
+            on_audio_data: Legacy callback receiving base64-encoded audio chunks.
+            on_raw_audio: Callback receiving raw PCM blocks (memoryviews into the block pool).
+            capture: Shared microphone capture to read from, instead of a stream of our own.
         """
         self._config = config
         self._on_audio_data = on_audio_data
-        self._stream: Optional[sd.InputStream] = None
+        self._on_raw_audio = on_raw_audio
+        self._capture = capture
+        self._stream: Optional["sd.RawInputStream"] = None
         self._stop_event: Optional[asyncio.Event] = None
         self._recording_start_time: Optional[float] = None
         self._timeout_reached = False
         self._loop: Optional[asyncio.AbstractEventLoop] = None
-        self._frames: list = []
+
+        self._block_bytes = config.input_chunk_size * config.input_channels * np.dtype(config.input_format).itemsize
+        self._pool = memoryview(bytearray(self._block_bytes * config.input_block_pool_size))
+        self._next_slot = 0
+        self.input_overflows = 0
 
     @property
     def timeout_reached(self) -> bool:
         """Whether recording stopped due to timeout."""
         return self._timeout_reached
 
-    async def start(self, stop_event: asyncio.Event) -> None:
+    async def start(self, stop_event: asyncio.Event, start_position: Optional[int] = None) -> None:
         """
         Start recording audio. Stops when stop_event is set or timeout.
 
         Args:
             stop_event: Event to signal recording should stop.
+            start_position: With a shared capture, absolute sample position to start
+                from (audio captured before start() is delivered first).
         """
         try:
             print("Starting recording...")
             self._stop_event = stop_event
             self._loop = asyncio.get_running_loop()
-            self._frames = []
             self._recording_start_time = time.time()
             self._timeout_reached = False
+            self.input_overflows = 0
 
-            self._stream = sd.InputStream(
+            if self._capture is not None:
+                self._capture.start()
+                self._capture.subscribe(self._on_block, start=start_position)
+                logger.log(AppMessage(content=f"{self.__class__.__name__}: Start recording (shared capture)"))
+                asyncio.create_task(self._monitor_timeout())
+                return
+
+            # Imported when a device is opened: PortAudio is not needed before (headless runs)
+            import sounddevice as sd
+
+            self._stream = sd.RawInputStream(
                 samplerate=self._config.input_sample_rate,
+                blocksize=self._config.input_chunk_size,
                 channels=self._config.input_channels,
-                dtype=self._config.input_format,
+                dtype=np.dtype(self._config.input_format).name,
                 callback=self._audio_callback,
             )
 
@@ -73,28 +110,44 @@ class AudioRecorder:
     def stop(self) -> None:
         """Stop the recording stream."""
         try:
+            if self._capture is not None:
+                self._capture.unsubscribe(self._on_block)
             if self._stream:
                 self._stream.stop()
                 self._stream.close()
                 self._stream = None
+                if self.input_overflows:
+                    logger.log(AppMessage(content=f"{self.__class__.__name__}: {self.input_overflows} input overflows"))
         except Exception as e:
             logger.log(ErrorMessage(content=f"{self.__class__.__name__} : stop: {e}"))
             raise
 
+    def _next_block(self, size: int) -> memoryview:
+        """Next slot of the block pool, sized for `size` bytes."""
+        if size > self._block_bytes:
+            # PortAudio delivered more than the requested blocksize; don't overwrite the next slot
+            return memoryview(bytearray(size))
+        start = self._next_slot * self._block_bytes
+        self._next_slot = (self._next_slot + 1) % self._config.input_block_pool_size
+        return self._pool[start:start + size]
+
     def _audio_callback(self, indata, frames, time_info, status) -> None:
         """Sounddevice callback - processes audio data."""
         if status:
-            print(status, flush=True)
+            self.input_overflows += 1
+        self._on_block(indata)
 
+    def _on_block(self, indata) -> None:
+        """Copies one captured block into the pool and hands it to the callbacks."""
         try:
             if self._stop_event and not self._stop_event.is_set():
-                raw_audio_data = indata.copy().astype(self._config.input_format).tobytes()
-                base64_audio = base64.b64encode(raw_audio_data).decode("utf-8")
-
-                # Send audio data via callback
-                self._on_audio_data(base64_audio)
+                block = self._next_block(len(indata))
+                block[:] = indata
 
-                self._frames.append(indata.copy())
+                if self._on_raw_audio:
+                    self._on_raw_audio(block)
+                if self._on_audio_data:
+                    self._on_audio_data(base64.b64encode(block).decode("utf-8"))
 
                 # Check for timeout
                 if (
@@ -111,7 +164,7 @@ class AudioRecorder:
                         asyncio.run_coroutine_threadsafe(set_stop(), self._loop)
 
         except Exception as e:
-            logger.log(ErrorMessage(content=f"{self.__class__.__name__} : _audio_callback: {e}"))
+            logger.log(ErrorMessage(content=f"{self.__class__.__name__} : _on_block: {e}"))
             print(f"Error in audio callback: {e}")
 
     async def _monitor_timeout(self) -> None:
@@ -0,0 +1,165 @@
+import threading
+from typing import TYPE_CHECKING, Callable, List, Optional
+
+import numpy as np
+
+from llm_engine.models import AudioConfig
+from logger import logger, AppMessage, ErrorMessage
+from .microphone_reader import MicrophoneReader
+from .sample_ring_buffer import SampleRingBuffer
+
+if TYPE_CHECKING:
+    import sounddevice as sd
+
+
+class MicrophoneCapture:
+    """
+    Owns the microphone: one always-on input stream writing into a SampleRingBuffer.
+
+    The stream is opened once, at `input_sample_rate`, and never handed over,
+    so switching between wake word detection and a realtime session costs no
+    device open/close. Consumers either:
+
+    - pull with a `MicrophoneReader` (`reader()`), each at its own position;
+    - or `subscribe` a callback receiving every new block, optionally starting
+      with the samples already captured since a given position (pre-roll).
+
+    Positions are absolute sample indexes, shared by all consumers.
+    """
+
+    def __init__(self, config: AudioConfig):
+        """
+        Args:
+            config: Audio configuration settings.
+        """
+        self._config = config
+        self._stream: Optional["sd.RawInputStream"] = None
+        self._ring = SampleRingBuffer(
+            int(config.capture_buffer_seconds * config.input_sample_rate),
+            dtype=config.input_format,
+        )
+        # Held by the capture callback while writing and dispatching; subscribers are
+        # added under it so a pre-roll backlog and the live blocks never overlap or miss a sample
+        self._lock = threading.Lock()
+        self._data_ready = threading.Condition()
+        self._subscribers: List[Callable[[memoryview], None]] = []
+        self.input_overflows = 0
+
+    @property
+    def sample_rate(self) -> int:
+        return self._config.input_sample_rate
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self._ring.dtype
+
+    @property
+    def position(self) -> int:
+        """Absolute index of the next sample to be captured."""
+        return self._ring.written
+
+    @property
+    def oldest(self) -> int:
+        """Absolute index of the oldest sample still buffered."""
+        return self._ring.oldest
+
+    @property
+    def is_running(self) -> bool:
+        return self._stream is not None
+
+    def start(self) -> None:
+        """Open the input stream if it is not open yet."""
+        if self._stream is not None:
+            return
+        try:
+            # Imported when a device is opened: PortAudio is not needed before (headless runs)
+            import sounddevice as sd
+
+            self._stream = sd.RawInputStream(
+                samplerate=self._config.input_sample_rate,
+                blocksize=self._config.input_chunk_size,
+                channels=self._config.input_channels,
+                dtype=np.dtype(self._config.input_format).name,
+                callback=self._audio_callback,
+            )
+            self._stream.start()
+            logger.log(AppMessage(content=f"{self.__class__.__name__}: microphone opened at {self.sample_rate} Hz"))
+        except Exception as e:
+            self._stream = None
+            logger.log(ErrorMessage(content=f"{self.__class__.__name__} : start: {e}"))
+            raise
+
+    def stop(self) -> None:
+        """Close the input stream."""
+        if self._stream is None:
+            return
+        try:
+            self._stream.stop()
+            self._stream.close()
+            if self.input_overflows:
+                logger.log(AppMessage(content=f"{self.__class__.__name__}: {self.input_overflows} input overflows"))
+        except Exception as e:
+            logger.log(ErrorMessage(content=f"{self.__class__.__name__} : stop: {e}"))
+        finally:
+            self._stream = None
+            with self._data_ready:
+                self._data_ready.notify_all()
+
+    def reader(self, start: Optional[int] = None) -> MicrophoneReader:
+        """
+        Pull-side consumer.
+
+        Args:
+            start: Absolute position to read from; defaults to the current position.
+        """
+        return MicrophoneReader(self, self.position if start is None else start)
+
+    def read(self, start: int, out: np.ndarray) -> bool:
+        """Copy samples [start, start + len(out)) into `out`; False if they are not (or no longer) buffered."""
+        return self._ring.read(start, out)
+
+    def wait_for(self, position: int, timeout: Optional[float] = None) -> bool:
+        """Block until samples up to `position` (excluded) are captured; False on timeout or when stopped."""
+        with self._data_ready:
+            return self._data_ready.wait_for(
+                lambda: self._ring.written >= position or self._stream is None, timeout
+            ) and self._ring.written >= position
+
+    def subscribe(self, callback: Callable[[memoryview], None], start: Optional[int] = None) -> None:
+        """
+        Call `callback` from the capture thread with every new block.
+
+        The memoryview is only valid during the call: copy it to keep it.
+
+        Args:
+            callback: Receives raw blocks in the input format.
+            start: Absolute position to start from. Samples already captured since
+                then are delivered first, in one block (clamped to what is still buffered).
+        """
+        with self._lock:
+            if start is not None:
+                start = max(start, self._ring.oldest)
+                backlog = np.empty(self._ring.written - start, dtype=self._ring.dtype)
+                if len(backlog) and self._ring.read(start, backlog):
+                    callback(memoryview(backlog).cast("B"))
+            self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[memoryview], None]) -> None:
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def _audio_callback(self, indata, frames, time_info, status) -> None:
+        """Sounddevice callback - buffers the block and hands it to the subscribers."""
+        if status:
+            self.input_overflows += 1
+
+        try:
+            with self._lock:
+                self._ring.write(np.frombuffer(indata, dtype=self._ring.dtype))
+                for callback in self._subscribers:
+                    callback(indata)
+            with self._data_ready:
+                self._data_ready.notify_all()
+        except Exception as e:
+            logger.log(ErrorMessage(content=f"{self.__class__.__name__} : _audio_callback: {e}"))
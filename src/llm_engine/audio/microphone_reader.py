@@ -0,0 +1,54 @@
+from typing import TYPE_CHECKING, Optional
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from .microphone_capture import MicrophoneCapture
+
+
+class MicrophoneReader:
+    """
+    Reads a MicrophoneCapture at its own pace, from its own position.
+
+    `read` returns a view of a buffer owned by the reader and reused by the
+    next call of the same size: copy it to keep it.
+    """
+
+    def __init__(self, capture: "MicrophoneCapture", position: int):
+        self._capture = capture
+        self.position = position
+        self._out: Optional[np.ndarray] = None
+        # Samples skipped because the reader fell behind by more than the capture buffer
+        self.dropped_samples = 0
+
+    @property
+    def lag(self) -> int:
+        """Samples captured and not read yet."""
+        return self._capture.position - self.position
+
+    def seek(self, position: int) -> None:
+        self.position = position
+
+    def seek_latest(self) -> None:
+        """Skip everything captured so far."""
+        self.position = self._capture.position
+
+    def read(self, count: int, timeout: Optional[float] = None) -> Optional[np.ndarray]:
+        """
+        Next `count` samples, waiting for them to be captured.
+
+        Returns:
+            The samples, or None if they were not captured within `timeout`.
+        """
+        if self._out is None or len(self._out) != count:
+            self._out = np.empty(count, dtype=self._capture.dtype)
+        while True:
+            if not self._capture.wait_for(self.position + count, timeout):
+                return None
+            if self.position < self._capture.oldest:
+                self.dropped_samples += self._capture.oldest - self.position
+                self.position = self._capture.oldest
+                continue
+            if self._capture.read(self.position, self._out):
+                self.position += count
+                return self._out
@@ -0,0 +1,79 @@
+import subprocess
+import time
+from pathlib import Path
+from typing import Optional, Union
+
+from llm_engine.models import AudioConfig
+from logger import logger, AppMessage, ErrorMessage
+
+
+class NotificationChime:
+    """
+    Notification sound decoded once to PCM16 at the playback sample rate.
+
+    Playing it only queues the samples on the audio player, so it never holds
+    up the caller for the duration of the sound.
+    """
+
+    def __init__(self, config: AudioConfig, sound_file: Union[str, Path]):
+        self._config = config
+        self._sound_file = Path(sound_file)
+        self._pcm: Optional[bytes] = None
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._pcm is not None
+
+    @property
+    def duration(self) -> float:
+        """Length of the chime in seconds."""
+        if not self._pcm:
+            return 0
+        return len(self._pcm) / self._config.bytes_per_sample / self._config.output_sample_rate
+
+    def load(self) -> bool:
+        """
+        Decode the sound file with ffmpeg.
+
+        Returns:
+            Whether the chime is ready to be played.
+        """
+        start = time.monotonic()
+        try:
+            result = subprocess.run(
+                [
+                    "ffmpeg",
+                    "-nostdin",
+                    "-loglevel",
+                    "error",
+                    "-i",
+                    str(self._sound_file),
+                    "-f",
+                    self._config.output_format,
+                    "-ac",
+                    "1",
+                    "-ar",
+                    str(self._config.output_sample_rate),
+                    "pipe:1",
+                ],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                timeout=10,
+                check=True,
+            )
+            self._pcm = result.stdout
+            logger.log(AppMessage(
+                content=f"{self.__class__.__name__}: decoded {self._sound_file.name} "
+                        f"({self.duration:.2f}s) in {(time.monotonic() - start) * 1000:.0f}ms"
+            ))
+        except Exception as e:
+            self._pcm = None
+            logger.log(ErrorMessage(content=f"{self.__class__.__name__} : load: {e}"))
+        return self.is_loaded
+
+    async def play(self, player) -> None:
+        """Queue the chime on the player (AudioPlayer or StreamAudioPlayer)."""
+        if self._pcm:
+            await player.stream_bytes(self._pcm)
+            # Play it out right away instead of waiting for more audio to fill the prebuffer
+            player.end_of_stream()
@@ -0,0 +1,68 @@
+import asyncio
+import base64
+import time
+from typing import Callable, Optional
+
+from llm_engine.models import AudioConfig
+
+
+class NullAudioPlayer:
+    """
+    Plays nothing, but keeps the clock of a device playing in real time.
+
+    Each chunk is "played" right after the previous one (or right away after
+    silence), so remaining_duration, wait_for_completion and on_playback_start
+    behave as with a real output, without any audio device. Same public API
+    as AudioPlayer; meant for headless runs and offline benchmarks.
+    """
+
+    def __init__(self, config: AudioConfig):
+        self._config = config
+        # Monotonic time the last queued sample finishes playing
+        self._play_end = 0.0
+        self.bytes_played = 0
+        self.chunks = 0
+        self.on_playback_start: Optional[Callable[[float], None]] = None
+
+    @property
+    def is_playing(self) -> bool:
+        return self._play_end > time.monotonic()
+
+    @property
+    def remaining_duration(self) -> float:
+        return max(0.0, self._play_end - time.monotonic())
+
+    @property
+    def underruns(self) -> int:
+        return 0
+
+    @property
+    def overruns(self) -> int:
+        return 0
+
+    async def stream_bytes(self, raw_bytes: bytes) -> None:
+        """Queue raw PCM16 bytes for (virtual) playback."""
+        now = time.monotonic()
+        if self._play_end <= now:
+            self._play_end = now
+            if self.on_playback_start:
+                self.on_playback_start(now)
+        self._play_end += len(raw_bytes) // self._config.bytes_per_sample / self._config.output_sample_rate
+        self.bytes_played += len(raw_bytes)
+        self.chunks += 1
+
+    async def stream_chunk(self, audio_base64: str) -> None:
+        await self.stream_bytes(base64.b64decode(audio_base64))
+
+    def end_of_stream(self) -> None:
+        pass
+
+    async def wait_for_completion(self) -> None:
+        """Wait until the last queued sample would have been played."""
+        remaining = self.remaining_duration
+        if remaining > 0:
+            await asyncio.sleep(remaining)
+
+    async def cleanup(self) -> None:
+        """Drop the audio not played yet."""
+        self._play_end = 0.0
@@ -0,0 +1,131 @@
+class PcmRingBuffer:
+    """
+    Fixed-size, preallocated single-producer/single-consumer ring of PCM bytes.
+
+    The producer (event loop) only calls `write`/`end_of_stream`/`clear`, the
+    consumer (output callback or pump thread) only calls `read_into`. Each side
+    only advances its own position, so no lock is needed: reading an int
+    written by the other thread is atomic in CPython.
+
+    It also acts as a jitter buffer: the consumer gets silence until
+    `prebuffer_bytes` are queued (or the stream is ending), and goes back to
+    prebuffering after an underrun.
+    """
+
+    def __init__(self, capacity: int, prebuffer_bytes: int = 0, frame_size: int = 2):
+        """
+        Args:
+            capacity: Size of the ring in bytes.
+            prebuffer_bytes: Bytes that must be queued before playback starts.
+            frame_size: Bytes per sample frame; reads and writes stay aligned on it.
+        """
+        capacity -= capacity % frame_size
+        self._buffer = bytearray(capacity)
+        self._view = memoryview(self._buffer)
+        self._capacity = capacity
+        self._frame_size = frame_size
+        self._prebuffer_bytes = min(prebuffer_bytes, capacity)
+
+        # Total bytes ever written/read; the producer owns _written, the consumer owns _read
+        self._written = 0
+        self._read = 0
+        # Set by the producer on clear(): the consumer skips everything written before it
+        self._cleared_to = 0
+        self._ending = False
+        self._playing = False
+
+        self.overruns = 0
+        self.underruns = 0
+        self.dropped_bytes = 0
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @property
+    def available(self) -> int:
+        """Bytes queued and not read yet."""
+        return self._written - max(self._read, self._cleared_to)
+
+    @property
+    def ending(self) -> bool:
+        """Whether end_of_stream was called and no data was written since."""
+        return self._ending
+
+    @property
+    def total_read(self) -> int:
+        """Bytes handed to the consumer since creation."""
+        return self._read
+
+    @property
+    def total_written(self) -> int:
+        return self._written
+
+    def write(self, data) -> int:
+        """
+        Copy data into the ring (producer side). Never blocks.
+
+        Bytes that don't fit are dropped and counted as an overrun.
+
+        Returns:
+            Number of bytes written.
+        """
+        data = memoryview(data).cast("B")
+        self._ending = False
+        free = self._capacity - (self._written - self._read)
+        size = len(data)
+        if size > free:
+            size = free - free % self._frame_size
+            self.overruns += 1
+            self.dropped_bytes += len(data) - size
+
+        start = self._written % self._capacity
+        first = min(size, self._capacity - start)
+        self._view[start:start + first] = data[:first]
+        if size > first:
+            self._view[:size - first] = data[first:size]
+        self._written += size
+        return size
+
+    def end_of_stream(self) -> None:
+        """No more data is coming for now: play what is queued without prebuffering."""
+        self._ending = True
+
+    def clear(self) -> None:
+        """Drop the queued data (applied by the consumer on its next read)."""
+        self._cleared_to = self._written
+
+    def read_into(self, out) -> int:
+        """
+        Copy up to len(out) queued bytes into out (consumer side). Never blocks.
+
+        Returns:
+            Number of bytes copied; the caller fills the rest with silence.
+        """
+        cleared_to = self._cleared_to
+        if cleared_to > self._read:
+            self._read = cleared_to
+            self._playing = False
+
+        available = self._written - self._read
+        if not self._playing:
+            if available == 0 or (available < self._prebuffer_bytes and not self._ending):
+                return 0
+            self._playing = True
+
+        out = memoryview(out).cast("B")
+        size = min(len(out), available)
+        size -= size % self._frame_size
+        if size < len(out) and not self._ending:
+            self.underruns += 1
+            self._playing = False
+
+        start = self._read % self._capacity
+        first = min(size, self._capacity - start)
+        out[:first] = self._view[start:start + first]
+        if size > first:
+            out[first:size] = self._view[:size - first]
+        self._read += size
+        if self._ending and self._written == self._read:
+            self._playing = False
+        return size
@@ -0,0 +1,17 @@
+from typing import Union
+
+from llm_engine.models import AudioConfig
+from .audio_player import AudioPlayer
+from .null_audio_player import NullAudioPlayer
+from .stream_audio_player import StreamAudioPlayer
+
+
+def create_audio_player(config: AudioConfig) -> Union[AudioPlayer, StreamAudioPlayer, NullAudioPlayer]:
+    """Build the playback backend selected by config.output_backend."""
+    if config.output_backend == "ffplay":
+        return AudioPlayer(config)
+    if config.output_backend == "sounddevice":
+        return StreamAudioPlayer(config)
+    if config.output_backend == "null":
+        return NullAudioPlayer(config)
+    raise ValueError(f"Unknown audio output backend: {config.output_backend}")
@@ -0,0 +1,84 @@
+from math import gcd
+
+import numpy as np
+
+
+class PolyphaseResampler:
+    """
+    Resamples fixed-size blocks by a rational factor with a polyphase FIR filter.
+
+    Equivalent to upsampling by `up`, low-pass filtering below the lower of
+    the two Nyquist frequencies (Kaiser-windowed sinc) and keeping one sample
+    in `down`, e.g. 24 kHz -> 16 kHz is up 2, down 3: content between 8 and
+    12 kHz is removed instead of folding into the output band. Only the
+    products that hit non-zero inputs and kept outputs are computed, as one
+    matrix-vector product per filter phase. The tail of each block is kept
+    so consecutive blocks are filtered as one stream; call reset() when the
+    input jumps (seek, skipped frames).
+
+    Block boundaries must line up: `block_size * out_rate / in_rate` has to
+    be an integer (e.g. 1920 samples at 24 kHz -> 1280 samples at 16 kHz).
+    """
+
+    def __init__(self, in_rate: int, out_rate: int, block_size: int, taps_per_phase: int = 48, beta: float = 8.0):
+        """
+        Args:
+            in_rate: Sample rate of the input blocks.
+            out_rate: Sample rate of the output blocks.
+            block_size: Number of input samples per block.
+            taps_per_phase: Filter length, in input samples; the whole filter has `up` times as many taps.
+            beta: Kaiser window parameter (stopband attenuation vs transition width).
+        """
+        if (block_size * out_rate) % in_rate:
+            raise ValueError(f"{block_size} samples at {in_rate} Hz is not a whole number of samples at {out_rate} Hz")
+        self.in_rate = in_rate
+        self.out_rate = out_rate
+        self.block_size = block_size
+        self.output_size = block_size * out_rate // in_rate
+        divisor = gcd(in_rate, out_rate)
+        self.up = out_rate // divisor
+        self.down = in_rate // divisor
+
+        # Low-pass at the upsampled rate, cut off slightly below the lower Nyquist frequency
+        taps = taps_per_phase * self.up
+        cutoff = 0.9 / max(self.up, self.down)
+        t = np.arange(taps) - (taps - 1) / 2
+        h = cutoff * np.sinc(cutoff * t) * np.kaiser(taps, beta)
+        # Unit DC gain once the zeros of the upsampling are accounted for
+        h *= self.up / h.sum()
+
+        # Output m sits at index down * m of the upsampled stream: its phase selects every up-th tap,
+        # applied to the taps_per_phase input samples ending at input (down * m) // up
+        upsampled = np.arange(self.output_size) * self.down
+        phases = upsampled % self.up
+        self._history = np.zeros(taps_per_phase - 1, dtype=np.float32)
+        self._buffer = np.zeros(len(self._history) + block_size, dtype=np.float32)
+        self._phases = []
+        for phase in range(self.up):
+            outputs = np.flatnonzero(phases == phase)
+            # Window start in the buffer (history + block) of each output, taps in window order
+            starts = upsampled[outputs] // self.up
+            weights = h[phase::self.up][::-1].astype(np.float32)
+            self._phases.append((outputs, starts, weights))
+
+    def reset(self) -> None:
+        """Forget the previous blocks, e.g. after skipping input."""
+        self._history[:] = 0
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        """Resample one block of `block_size` samples; returns `output_size` samples of the same dtype."""
+        if self.in_rate == self.out_rate:
+            return block
+        buffer = self._buffer
+        buffer[:len(self._history)] = self._history
+        buffer[len(self._history):] = block
+        windows = np.lib.stride_tricks.sliding_window_view(buffer, len(self._history) + 1)
+        resampled = np.empty(self.output_size, dtype=np.float32)
+        for outputs, starts, weights in self._phases:
+            resampled[outputs] = windows[starts] @ weights
+        self._history[:] = buffer[len(buffer) - len(self._history):]
+
+        if np.issubdtype(block.dtype, np.integer):
+            info = np.iinfo(block.dtype)
+            resampled = np.clip(np.rint(resampled), info.min, info.max)
+        return resampled.astype(block.dtype)
@@ -0,0 +1,75 @@
+import numpy as np
+
+
+class SampleRingBuffer:
+    """
+    Fixed-size, preallocated ring of mono samples addressed by absolute sample index.
+
+    A single producer (the capture callback) appends with `write`; any number
+    of readers copy ranges out with `read`, each keeping its own position.
+    Readers never block the producer: a reader that falls more than
+    `capacity` samples behind loses the oldest samples, which `read` reports.
+    """
+
+    def __init__(self, capacity: int, dtype=np.int16):
+        """
+        Args:
+            capacity: Number of samples kept.
+            dtype: Sample type.
+        """
+        self._buffer = np.zeros(capacity, dtype=dtype)
+        self._capacity = capacity
+        # Absolute index of the next sample to be written; only the producer advances it
+        self._written = 0
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self._buffer.dtype
+
+    @property
+    def written(self) -> int:
+        """Absolute index of the next sample to be written (total samples written)."""
+        return self._written
+
+    @property
+    def oldest(self) -> int:
+        """Absolute index of the oldest sample still in the ring."""
+        return max(0, self._written - self._capacity)
+
+    def write(self, samples: np.ndarray) -> None:
+        """Append samples, overwriting the oldest ones once the ring is full."""
+        count = len(samples)
+        if count > self._capacity:
+            self._written += count - self._capacity
+            samples = samples[-self._capacity:]
+            count = self._capacity
+
+        start = self._written % self._capacity
+        first = min(count, self._capacity - start)
+        self._buffer[start:start + first] = samples[:first]
+        self._buffer[:count - first] = samples[first:]
+        # Publish only once the samples are in place
+        self._written += count
+
+    def read(self, start: int, out: np.ndarray) -> bool:
+        """
+        Copy samples [start, start + len(out)) into `out`.
+
+        Returns:
+            False if part of the range was not written yet or was overwritten
+            (before or during the copy); `out` is then unusable.
+        """
+        count = len(out)
+        if start < self.oldest or start + count > self._written:
+            return False
+
+        offset = start % self._capacity
+        first = min(count, self._capacity - offset)
+        out[:first] = self._buffer[offset:offset + first]
+        out[first:] = self._buffer[:count - first]
+        # The producer may have lapped us while copying
+        return start >= self.oldest
@@ -0,0 +1,214 @@
+import asyncio
+import base64
+import time
+from typing import TYPE_CHECKING, Callable, Optional
+
+
+from llm_engine.models import AudioConfig
+from logger import logger, AppMessage, ErrorMessage
+from .pcm_ring_buffer import PcmRingBuffer
+
+if TYPE_CHECKING:
+    import sounddevice as sd
+
+
+class StreamAudioPlayer:
+    """
+    Handles audio playback through a persistent sounddevice output stream.
+
+    The stream is opened once and kept open across responses, so playing a
+    response only means handing PCM16 samples to the output callback.
+    Same public API as AudioPlayer.
+
+    stream_bytes only copies into a preallocated PcmRingBuffer; the output
+    callback is its single consumer and never waits on the event loop.
+
+    The callback also tracks when the last consumed sample reaches the DAC,
+    so `drained()` resolves when playback really ends instead of after a
+    wall-clock estimate.
+    """
+
+    def __init__(self, config: AudioConfig):
+        self._config = config
+        self._stream: Optional["sd.RawOutputStream"] = None
+        self._ring = PcmRingBuffer(
+            config.playback_buffer_bytes,
+            prebuffer_bytes=config.playback_prebuffer_bytes,
+            frame_size=config.bytes_per_sample,
+        )
+        self._silence = bytes(4096)
+        self._reported_underruns = 0
+        self._reported_overruns = 0
+        self._stream_start_time: Optional[float] = None
+        self._total_audio_duration: float = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._drained: Optional[asyncio.Future] = None
+        # Written by the output callback: monotonic time the last consumed sample is played at
+        self._last_sample_time = 0.0
+        self._drain_signalled = False
+        self._emitting = False
+        # Called from the output callback with the monotonic time audio starts playing after silence
+        self.on_playback_start: Optional[Callable[[float], None]] = None
+
+    @property
+    def is_playing(self) -> bool:
+        """Whether audio is waiting to be played."""
+        return self._ring.available > 0
+
+    @property
+    def remaining_duration(self) -> float:
+        """Remaining playback duration of the buffered audio, in seconds."""
+        samples = self._ring.available // self._config.bytes_per_sample
+        return samples / self._config.output_sample_rate
+
+    @property
+    def underruns(self) -> int:
+        """Number of times the device ran out of audio in the middle of a response."""
+        return self._ring.underruns
+
+    @property
+    def overruns(self) -> int:
+        """Number of chunks that did not fit in the jitter buffer."""
+        return self._ring.overruns
+
+    def open(self) -> None:
+        """Open the output stream if it is not open yet."""
+        if self._stream is not None:
+            return
+        try:
+            # Imported when a device is opened: PortAudio is not needed before (headless runs)
+            import sounddevice as sd
+
+            self._stream = sd.RawOutputStream(
+                samplerate=self._config.output_sample_rate,
+                channels=1,
+                dtype="int16",
+                device=self._config.output_device,
+                latency=self._config.output_latency,
+                callback=self._output_callback,
+            )
+            self._stream.start()
+            logger.log(AppMessage(content=f"{self.__class__.__name__}: output stream opened (latency={self._stream.latency:.3f}s)"))
+        except Exception as e:
+            self._stream = None
+            logger.log(ErrorMessage(content=f"{self.__class__.__name__} : open: {e}"))
+            raise
+
+    def close(self) -> None:
+        """Close the output stream."""
+        if self._stream is not None:
+            try:
+                self._stream.stop()
+                self._stream.close()
+            except Exception as e:
+                logger.log(ErrorMessage(content=f"{self.__class__.__name__} : close: {e}"))
+            finally:
+                self._stream = None
+
+    async def stream_bytes(self, raw_bytes: bytes) -> None:
+        """Queue raw PCM16 bytes for playback."""
+        try:
+            self.open()
+            self._loop = asyncio.get_running_loop()
+            if self._drained is not None and self._drained.done():
+                self._drained = None
+            self._drain_signalled = False
+            chunk_duration = len(raw_bytes) // self._config.bytes_per_sample / self._config.output_sample_rate
+            self._total_audio_duration += chunk_duration
+            if self._stream_start_time is None:
+                self._stream_start_time = time.time()
+            self._ring.write(raw_bytes)
+        except Exception as e:
+            print(f"[{self.__class__.__name__}] Error streaming audio bytes: {type(e).__name__}: {e}")
+            logger.log(ErrorMessage(content=f"{self.__class__.__name__} stream_bytes: {type(e).__name__}: {e}"))
+
+    async def stream_chunk(self, audio_base64: str) -> None:
+        """Queue a base64-encoded audio chunk for playback."""
+        await self.stream_bytes(base64.b64decode(audio_base64))
+
+    def drained(self) -> asyncio.Future:
+        """
+        Future resolved when the last sample of the current response has been played.
+
+        The response is considered complete once wait_for_completion (or end_of_stream) was called.
+        """
+        if self._drained is None:
+            self._drained = asyncio.get_running_loop().create_future()
+            if self._stream is None or self._stream_start_time is None:
+                self._drained.set_result(None)
+        return self._drained
+
+    def end_of_stream(self) -> None:
+        """No more audio is coming for the current response."""
+        self._ring.end_of_stream()
+
+    async def wait_for_completion(self) -> None:
+        """Wait until the last buffered sample has been played."""
+        self.end_of_stream()
+        if self._stream is None or self._stream_start_time is None:
+            self._report_buffer_stats()
+            return
+
+        # What the ffplay backend would have waited for, to measure how far off it is
+        estimate = max(0.0, self._total_audio_duration - (time.time() - self._stream_start_time)) + 1
+        started = time.monotonic()
+        try:
+            await asyncio.wait_for(asyncio.shield(self.drained()), timeout=self.remaining_duration + 5)
+        except asyncio.TimeoutError:
+            logger.log(ErrorMessage(content=f"{self.__class__.__name__} : wait_for_completion: output stream did not drain"))
+        measured = time.monotonic() - started
+        logger.log(AppMessage(
+            content=f"{self.__class__.__name__}: playback drained in {measured:.3f}s, "
+                    f"wall-clock estimate was {estimate:.3f}s (error {estimate - measured:+.3f}s)"
+        ))
+        self._report_buffer_stats()
+
+    async def cleanup(self) -> None:
+        """Drop the audio not played yet; the output stream stays open."""
+        self._ring.clear()
+        self._report_buffer_stats()
+        if self._drained is not None and not self._drained.done():
+            self._drained.set_result(None)
+        self._drained = None
+        self._stream_start_time = None
+        self._total_audio_duration = 0
+
+    def _output_callback(self, outdata, frames, time_info, status) -> None:
+        """Sounddevice callback - hands buffered samples to the device, silence when there are none."""
+        size = self._ring.read_into(outdata)
+        missing = len(outdata) - size
+        if missing:
+            if missing > len(self._silence):
+                self._silence = bytes(missing)
+            outdata[size:] = self._silence[:missing]
+
+        if size:
+            # The buffer starts playing at outputBufferDacTime (stream clock); 0 when the host API doesn't report it
+            dac_delay = time_info.outputBufferDacTime - time_info.currentTime
+            if dac_delay <= 0:
+                dac_delay = self._stream.latency if self._stream is not None else 0
+            samples = size // self._config.bytes_per_sample
+            now = time.monotonic()
+            self._last_sample_time = now + dac_delay + samples / self._config.output_sample_rate
+            if not self._emitting and self.on_playback_start:
+                self.on_playback_start(now + dac_delay)
+        self._emitting = size > 0
+
+        if self._ring.ending and self._ring.available == 0 and not self._drain_signalled and self._loop:
+            self._drain_signalled = True
+            self._loop.call_soon_threadsafe(self._resolve_drained_at, self._last_sample_time)
+
+    def _resolve_drained_at(self, play_end: float) -> None:
+        future = self.drained()
+        if not future.done():
+            delay = max(0.0, play_end - time.monotonic())
+            self._loop.call_later(delay, lambda: future.done() or future.set_result(None))
+
+    def _report_buffer_stats(self) -> None:
+        if (self._ring.underruns, self._ring.overruns) != (self._reported_underruns, self._reported_overruns):
+            logger.log(AppMessage(
+                content=f"{self.__class__.__name__}: jitter buffer underruns={self._ring.underruns}, "
+                        f"overruns={self._ring.overruns} (dropped {self._ring.dropped_bytes} bytes)"
+            ))
+            self._reported_underruns = self._ring.underruns
+            self._reported_overruns = self._ring.overruns
@@ -0,0 +1,144 @@
+import asyncio
+import time
+from collections import deque
+from typing import Awaitable, Callable, Optional
+
+from llm_engine.models import AudioConfig
+
+
+class UplinkSender:
+    """
+    Hands microphone blocks from the PortAudio thread to the realtime session.
+
+    `push` (PortAudio thread) schedules the block on the event loop with
+    call_soon_threadsafe; `run` awaits an asyncio.Queue, so a block is sent as
+    soon as the loop gets to it and nothing wakes up while the mic is idle.
+    Blocks can be coalesced into packets of `uplink_packet_ms` before sending.
+
+    Blocks are memoryviews into the recorder's pool, whose slots are reused
+    every `input_block_pool_size` blocks. `push` counts the blocks pushed but
+    not sent yet (or copied into a packet); when that reaches the pool size,
+    the next capture would overwrite the oldest of them, so `push` copies it
+    out of the pool first. The count includes blocks still waiting in the
+    call_soon_threadsafe backlog, so a stalled loop never corrupts audio.
+
+    Created without `send`, it buffers what is pushed until attach() gives it
+    the session, so the microphone can be opened before the connection is.
+    """
+
+    def __init__(self, config: AudioConfig, send: Optional[Callable[[bytes], Awaitable[None]]] = None):
+        """
+        Args:
+            config: Audio configuration settings.
+            send: Coroutine function sending one packet (e.g. session.send_audio); see attach().
+        """
+        self._send = send
+        self._config = config
+        self._loop = asyncio.get_running_loop()
+        self._queue: asyncio.Queue = asyncio.Queue()
+
+        bytes_per_ms = config.input_sample_rate * config.input_channels * config.bytes_per_sample / 1000
+        self._packet_bytes = int(config.uplink_packet_ms * bytes_per_ms)
+        self._packet_bytes -= self._packet_bytes % config.bytes_per_sample
+        self._packet = bytearray()
+        self._packet_time: Optional[float] = None
+
+        # Single-writer counters: _pushed on the audio thread, _released on the loop
+        self._pushed = 0
+        self._released = 0
+        # Holders ([block]) of the last pool-size pushed blocks, audio thread only
+        self._recent: deque = deque(maxlen=config.input_block_pool_size)
+        self.blocks_copied = 0
+
+        self.blocks_received = 0
+        self.packets_sent = 0
+        self.max_queue_depth = 0
+        self.total_send_latency = 0.0
+        self.max_send_latency = 0.0
+        # time.monotonic() when the first packet was handed to the session
+        self.first_send_at: Optional[float] = None
+        # Packets queued before attach()
+        self.buffered_packets = 0
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    @property
+    def mean_send_latency(self) -> float:
+        """Mean time from capture to the end of session.send_audio, in seconds."""
+        return self.total_send_latency / self.packets_sent if self.packets_sent else 0.0
+
+    @property
+    def attached(self) -> bool:
+        return self._send is not None
+
+    def attach(self, send: Callable[[bytes], Awaitable[None]]) -> None:
+        """Set the session to send to; packets buffered so far go out first once run() starts."""
+        self._send = send
+        self.buffered_packets = self._queue.qsize()
+
+    @property
+    def in_flight(self) -> int:
+        """Blocks pushed and not yet sent (or copied into a packet)."""
+        return self._pushed - self._released
+
+    def push(self, block: memoryview) -> None:
+        """Thread-safe: queue a captured block for sending."""
+        holder = [block]
+        self._recent.append(holder)
+        self._pushed += 1
+        if self.in_flight >= self._config.input_block_pool_size:
+            # The next capture reuses the slot of the oldest unsent block: copy it out of the pool
+            oldest = self._recent[0]
+            if isinstance(oldest[0], memoryview):
+                oldest[0] = bytes(oldest[0])
+                self.blocks_copied += 1
+        self._loop.call_soon_threadsafe(self._enqueue, holder, time.monotonic())
+
+    def _enqueue(self, holder: list, captured_at: float) -> None:
+        self.blocks_received += 1
+        if self._packet_bytes <= 0:
+            self._put(holder, captured_at)
+            return
+
+        if not self._packet:
+            self._packet_time = captured_at
+        self._packet += holder[0]
+        self._released += 1
+        while len(self._packet) >= self._packet_bytes:
+            self._put([bytes(self._packet[:self._packet_bytes])], self._packet_time)
+            del self._packet[:self._packet_bytes]
+            self._packet_time = captured_at
+
+    def _put(self, holder: list, captured_at: float) -> None:
+        self._queue.put_nowait((holder, captured_at))
+        self.max_queue_depth = max(self.max_queue_depth, self._queue.qsize())
+
+    def flush(self) -> None:
+        """Queue the partially filled packet, if any."""
+        if self._packet:
+            self._put([bytes(self._packet)], self._packet_time)
+            self._packet.clear()
+
+    async def run(self) -> None:
+        """Send queued packets until cancelled."""
+        while True:
+            holder, captured_at = await self._queue.get()
+            if self.first_send_at is None:
+                self.first_send_at = time.monotonic()
+            await self._send(holder[0])
+            if self._packet_bytes <= 0:
+                self._released += 1
+            latency = time.monotonic() - captured_at
+            self.packets_sent += 1
+            self.total_send_latency += latency
+            self.max_send_latency = max(self.max_send_latency, latency)
+
+    def stats(self) -> str:
+        return (
+            f"blocks={self.blocks_received}, packets={self.packets_sent}, "
+            f"buffered_before_connect={self.buffered_packets}, max_queue_depth={self.max_queue_depth}, "
+            f"copied_out_of_pool={self.blocks_copied}, "
+            f"send_latency mean={self.mean_send_latency * 1000:.1f}ms max={self.max_send_latency * 1000:.1f}ms"
+        )
@@ -1,5 +1,6 @@
 import numpy as np
 from dataclasses import dataclass
+from typing import Optional, Union
 
 
 @dataclass
@@ -12,8 +13,36 @@ class AudioConfig:
     input_chunk_size: int = 1024
     input_format: type = np.int16
     max_recording_duration: int = 60
+    # Microphone blocks are copied into this many preallocated slots, reused round-robin
+    input_block_pool_size: int = 64
+    # Coalesce microphone blocks into packets of this duration before sending them (0: send each block)
+    uplink_packet_ms: int = 0
+    # Always-on microphone capture: seconds of audio kept for late consumers
+    capture_buffer_seconds: float = 10.0
+    # Audio sent to the session from before the wake word detection point
+    preroll_ms: int = 300
 
     # Playback settings
     output_sample_rate: int = 24000
     output_format: str = "s16le"
     bytes_per_sample: int = 2
+    # "ffplay": one ffplay process per response, "sounddevice": one persistent output stream,
+    # "null": no device, playback is only timed (benchmarks)
+    output_backend: str = "ffplay"
+    output_device: Optional[Union[int, str]] = None
+    output_latency: Union[float, str] = "low"
+    # Jitter buffer between realtime audio events and the output device
+    playback_buffer_seconds: float = 60.0
+    playback_prebuffer_ms: int = 100
+
+    @property
+    def preroll_samples(self) -> int:
+        return self.preroll_ms * self.input_sample_rate // 1000
+
+    @property
+    def playback_buffer_bytes(self) -> int:
+        return int(self.playback_buffer_seconds * self.output_sample_rate) * self.bytes_per_sample
+
+    @property
+    def playback_prebuffer_bytes(self) -> int:
+        return self.playback_prebuffer_ms * self.output_sample_rate // 1000 * self.bytes_per_sample
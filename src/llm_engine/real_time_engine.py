@@ -1,21 +1,25 @@
 import asyncio
-import base64
 import json
-import queue
 import subprocess
-from pathlib import Path
-from typing import Callable, Optional
+import time
+from typing import Any, Awaitable, Callable, Optional
 
 from agents import FunctionTool
 from agents.realtime import RealtimeAgent, RealtimeRunner
 
+from config import Config
 from tools.tool import Tool
-from llm_engine.audio import AudioRecorder, AudioPlayer
+from llm_engine.audio import (
+    AudioRecorder,
+    MicrophoneCapture,
+    NotificationChime,
+    UplinkSender,
+    create_audio_player,
+)
 from llm_engine.models import AudioConfig, ConversationResult
 from session.conversation import Conversation
 from logger import logger, AppMessage, ErrorMessage
-
-_SCRIPT_DIR = Path(__file__).parent
+from tracing import TurnTrace, trace_store
 
 
 def _to_function_tool(tool: Tool) -> FunctionTool:
@@ -38,23 +42,70 @@ def _to_function_tool(tool: Tool) -> FunctionTool:
     )
 
 
+# (agent, runner config) -> awaitable of an async context manager yielding the session:
+# an async iterator of SDK-shaped events with an async send_audio(bytes)
+SessionFactory = Callable[[RealtimeAgent, dict], Awaitable[Any]]
+
+
+async def open_realtime_session(agent: RealtimeAgent, config: dict):
+    """Default SessionFactory: a live session through the openai-agents RealtimeRunner."""
+    return await RealtimeRunner(starting_agent=agent, config=config).run()
+
+
 class RealTimeEngine:
     """
     Facade coordinating real-time voice interaction via the openai-agents SDK.
 
     Public API:
-        - __init__(tools: list[Tool])
+        - __init__(tools: list[Tool], audio_config: Optional[AudioConfig], capture: Optional[MicrophoneCapture],
+                   session_factory: Optional[SessionFactory])
         - start() -> Optional[ConversationResult]
     """
 
-    def __init__(self, tools: list[Tool] = None):
+    def __init__(
+        self,
+        tools: list[Tool] = None,
+        audio_config: Optional[AudioConfig] = None,
+        capture: Optional[MicrophoneCapture] = None,
+        session_factory: Optional[SessionFactory] = None,
+    ):
         self._tools = list(tools) if tools else []
-        self._audio_config = AudioConfig()
+        self._audio_config = audio_config or AudioConfig()
+        # Shared always-on microphone; without it each session opens its own input stream
+        self._capture = capture
+        # Opens the realtime session; a scripted fake one replaces it offline (benchmarks)
+        self._session_factory = session_factory or open_realtime_session
+        # Built once: the agent on the first session (its prompt needs the .env values)
+        self._agent: Optional[RealtimeAgent] = None
+        self._runner_config = {
+            "model_settings": {
+                "model_name": "gpt-realtime-mini",
+                "voice": "echo",
+                "modalities": ["audio"],
+                "input_audio_format": "pcm16",
+                "output_audio_format": "pcm16",
+                "input_audio_transcription": {"model": "gpt-4o-mini-transcribe"},
+                "turn_detection": {
+                    "type": "server_vad",
+                    "threshold": 0.5,
+                    "silence_duration_ms": 1000,
+                    "prefix_padding_ms": 500,
+                },
+            }
+        }
+        # Kept across sessions so a persistent output backend stays open between turns
+        self._player = create_audio_player(self._audio_config)
+        self._chime = NotificationChime(self._audio_config, Config.NOTIFICATION_SOUND)
+        self._chime.load()
+        # ffplay fallback tasks, referenced until done so they are not garbage-collected
+        self._notify_tasks: set[asyncio.Task] = set()
 
     async def start(
         self,
         on_user_transcript: Optional[Callable[[str], None]] = None,
         on_assistant_transcript: Optional[Callable[[str], None]] = None,
+        start_position: Optional[int] = None,
+        trace: Optional[TurnTrace] = None,
     ) -> Optional[ConversationResult]:
         """
         Start a real-time voice interaction session.
@@ -62,63 +113,49 @@ class RealTimeEngine:
         Args:
             on_user_transcript: Optional callback invoked when the user transcript is available.
             on_assistant_transcript: Optional callback invoked when the assistant transcript is available.
+            start_position: Capture position of the wake word detection. With a shared capture,
+                uplink starts `preroll_ms` before it, so nothing said since is lost.
+            trace: Latency trace of the turn, persisted by the caller. Without one,
+                the session gets its own trace, persisted when it ends.
 
         Returns a ConversationResult with user and assistant transcripts.
         """
-        sdk_tools = [_to_function_tool(t) for t in self._tools]
-        agent = RealtimeAgent(
-            name="Jarvis",
-            instructions=Conversation()._get_prompt(),
-            tools=sdk_tools,
-        )
-        runner = RealtimeRunner(
-            starting_agent=agent,
-            config={
-                "model_settings": {
-                    "model_name": "gpt-realtime-mini",
-                    "voice": "echo",
-                    "modalities": ["audio"],
-                    "input_audio_format": "pcm16",
-                    "output_audio_format": "pcm16",
-                    "input_audio_transcription": {"model": "gpt-4o-mini-transcribe"},
-                    "turn_detection": {
-                        "type": "server_vad",
-                        "threshold": 0.5,
-                        "silence_duration_ms": 1000,
-                        "prefix_padding_ms": 500,
-                    },
-                }
-            },
-        )
+        owns_trace = trace is None
+        trace = trace or TurnTrace()
+        started = trace.mark("engine_start")
 
-        audio_queue: queue.Queue = queue.Queue()
         stop_recording = asyncio.Event()
-        player = AudioPlayer(self._audio_config)
-        recorder = AudioRecorder(
-            config=self._audio_config,
-            on_audio_data=audio_queue.put_nowait,
-        )
+        player = self._player
+        uplink: Optional[UplinkSender] = None
 
         user_transcript: Optional[str] = None
         assistant_transcript: Optional[str] = None
         audio_task = None
 
         try:
-            async with await runner.run() as session:
-                print("Session started. You can speak now...")
+            agent = self._get_agent()
+            # The mic opens and the chime plays before connecting: the user can talk
+            # right away, the uplink buffers until the session is ready
+            uplink = UplinkSender(config=self._audio_config)
+            recorder = AudioRecorder(config=self._audio_config, on_raw_audio=uplink.push, capture=self._capture)
+            if start_position is not None:
+                start_position = max(0, start_position - self._audio_config.preroll_samples)
+            await recorder.start(stop_recording, start_position=start_position)
+            trace.mark("mic_open")
+            await self.notify(trace)
+
+            trace.mark("connect_start")
+            async with await self._session_factory(agent, self._runner_config) as session:
+                connected = trace.mark("session_connected")
+                print("Session connected.")
                 logger.log(AppMessage(content="Connected via openai-agents SDK"))
-                await recorder.start(stop_recording)
-
-                async def send_audio_loop():
-                    while not stop_recording.is_set():
-                        try:
-                            b64 = audio_queue.get_nowait()
-                            await session.send_audio(base64.b64decode(b64))
-                        except queue.Empty:
-                            await asyncio.sleep(0.01)
-
-                audio_task = asyncio.create_task(send_audio_loop())
-                await asyncio.to_thread(self._notify)
+                uplink.attach(session.send_audio)
+                audio_task = asyncio.create_task(uplink.run())
+                logger.log(AppMessage(
+                    content=f"Mic open {(trace.marks['mic_open'] - started) * 1000:.0f}ms after start, "
+                            f"connected after {(connected - started) * 1000:.0f}ms, "
+                            f"{uplink.buffered_packets} packets buffered meanwhile"
+                ))
 
                 async for event in session:
                     if event.type != "raw_model_event":
@@ -132,6 +169,9 @@ class RealTimeEngine:
                         logger.log(AppMessage(content=f"Agent ended: {event.agent.name}"))
 
                     elif event.type == "audio":
+                        if "first_audio" not in trace.marks:
+                            trace.mark("first_audio")
+                            player.on_playback_start = lambda at: trace.mark("first_sample_played", at)
                         await player.stream_bytes(event.audio.data)
 
                     elif event.type == "audio_end":
@@ -143,10 +183,12 @@ class RealTimeEngine:
 
                     elif event.type == "tool_start":
                         tool_name = getattr(event.tool, "name", str(event.tool))
+                        trace.begin(f"tool:{tool_name}")
                         logger.log(AppMessage(content=f"Tool call: {tool_name}"))
 
                     elif event.type == "tool_end":
                         tool_name = getattr(event.tool, "name", str(event.tool))
+                        trace.end(f"tool:{tool_name}")
                         logger.log(AppMessage(content=f"Tool result: {tool_name} → {event.output}"))
 
                     elif event.type == "handoff":
@@ -159,6 +201,8 @@ class RealTimeEngine:
                         inner_type = getattr(inner, "type", None)
                         if inner_type != "raw_server_event":
                             print(f"  [raw] {inner_type}")
+                        elif isinstance(inner.data, dict) and inner.data.get("type") == "input_audio_buffer.speech_stopped":
+                            trace.mark("speech_end", overwrite=True)
                         if inner_type == "conversation.item.input_audio_transcription.completed":
                             user_transcript = getattr(inner, "transcript", None)
                             if user_transcript and on_user_transcript:
@@ -182,23 +226,61 @@ class RealTimeEngine:
             stop_recording.set()
             if audio_task and not audio_task.done():
                 audio_task.cancel()
+            if uplink:
+                logger.log(AppMessage(content=f"Uplink: {uplink.stats()}"))
+                if uplink.first_send_at is not None:
+                    trace.mark("first_uplink", uplink.first_send_at)
             await player.wait_for_completion()
+            trace.mark("last_sample_played")
+            player.on_playback_start = None
             await player.cleanup()
+            if owns_trace:
+                trace_store.append(trace)
 
         return ConversationResult(
             user_transcript=user_transcript,
             assistant_transcript=assistant_transcript,
         )
 
+    def _get_agent(self) -> RealtimeAgent:
+        """The realtime agent, with its rendered prompt and wrapped tools, built on first use."""
+        if self._agent is None:
+            self._agent = RealtimeAgent(
+                name="Jarvis",
+                instructions=Conversation()._get_prompt(),
+                tools=[_to_function_tool(t) for t in self._tools],
+            )
+        return self._agent
+
+    async def notify(self, trace: Optional[TurnTrace] = None) -> None:
+        """
+        Play the notification sound without waiting for it to finish.
+
+        Args:
+            trace: Turn trace getting the (estimated) time the chime ends as `chime_done`.
+        """
+        if self._chime.is_loaded:
+            await self._chime.play(self._player)
+            if trace:
+                trace.mark("chime_done", time.monotonic() + self._player.remaining_duration)
+        else:
+            # The chime could not be decoded at startup: fall back to ffplay, in the background
+            task = asyncio.create_task(asyncio.to_thread(self._notify))
+            self._notify_tasks.add(task)
+            task.add_done_callback(self._notify_tasks.discard)
+
     def _notify(self, retries: int = 1) -> None:
-        """Play notification sound."""
+        """Play notification sound with ffplay."""
         try:
             subprocess.run(
-                ["ffplay", "-nodisp", "-autoexit", str(_SCRIPT_DIR.parent / "listening.mp3")],
+                ["ffplay", "-nodisp", "-autoexit", str(Config.NOTIFICATION_SOUND)],
                 stdout=subprocess.DEVNULL,
                 stderr=subprocess.DEVNULL,
                 timeout=1.5,
+                check=True,
             )
         except subprocess.TimeoutExpired:
             if retries > 0:
                 self._notify(retries=retries - 1)
+        except (OSError, subprocess.CalledProcessError) as e:
+            logger.log(ErrorMessage(content=f"{self.__class__.__name__} : _notify: {e}"))
@@ -0,0 +1,16 @@
+from .jsonl_log_store import JsonlLogStore, FsyncPolicy
+from .background_log_writer import BackgroundLogWriter, OverflowPolicy
+from .log_index import LogIndex, ROLES
+from .log_segment import LogSegment
+from .log_page import LogPage
+
+__all__ = [
+    "JsonlLogStore",
+    "FsyncPolicy",
+    "BackgroundLogWriter",
+    "OverflowPolicy",
+    "LogIndex",
+    "ROLES",
+    "LogSegment",
+    "LogPage",
+]
@@ -0,0 +1,143 @@
+import atexit
+import threading
+from collections import deque
+from enum import Enum
+from typing import Any, Callable, Optional, Union
+
+from .jsonl_log_store import JsonlLogStore
+
+
+def _as_record(item: Any) -> dict:
+    return item.model_dump() if hasattr(item, "model_dump") else item
+
+
+class OverflowPolicy(str, Enum):
+    """What happens to a record submitted while the queue is full."""
+
+    DROP_OLDEST = "drop_oldest"
+    DROP_NEWEST = "drop_newest"
+
+
+class BackgroundLogWriter:
+    """
+    Queue in front of a JsonlLogStore, drained by a dedicated writer thread.
+
+    `submit` only appends to a bounded in-memory deque and never touches the
+    disk or waits on a lock held by the writer, so it is safe to call from
+    the event loop, PortAudio callbacks and the wake word loop.
+    """
+
+    def __init__(
+        self,
+        store: JsonlLogStore,
+        max_queue_size: int = 10000,
+        batch_size: int = 256,
+        flush_interval: float = 0.5,
+        overflow_policy: Union[OverflowPolicy, str] = OverflowPolicy.DROP_OLDEST,
+        drop_notice: Optional[Callable[[int], Any]] = None,
+    ):
+        """
+        Args:
+            store: Store the records are written to.
+            max_queue_size: Maximum number of pending records kept in memory.
+            batch_size: Number of pending records that wakes the writer before flush_interval elapses.
+            flush_interval: Maximum number of seconds a record waits in the queue.
+            overflow_policy: Which record is lost when the queue is full.
+            drop_notice: Builds the record written in place of dropped records, given how many were dropped.
+        """
+        self._store = store
+        self._max_queue_size = max_queue_size
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._overflow_policy = OverflowPolicy(overflow_policy)
+        self._drop_notice = drop_notice
+
+        maxlen = max_queue_size if self._overflow_policy == OverflowPolicy.DROP_OLDEST else None
+        self._queue: deque = deque(maxlen=maxlen)
+        self._wakeup = threading.Event()
+        self._flush_waiters: list[threading.Event] = []
+        self._dropped = 0
+        self._reported_dropped = 0
+        self._running = True
+
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    @property
+    def dropped(self) -> int:
+        """Total number of records lost because the queue was full."""
+        return self._dropped
+
+    @property
+    def pending(self) -> int:
+        return len(self._queue)
+
+    def submit(self, record: Any) -> bool:
+        """
+        Enqueue a record (a dict or a pydantic model) without blocking.
+
+        Returns:
+            False if the record, or an older one, was dropped to make room.
+        """
+        if len(self._queue) >= self._max_queue_size:
+            self._dropped += 1
+            if self._overflow_policy == OverflowPolicy.DROP_NEWEST:
+                return False
+            self._queue.append(record)
+            return False
+
+        self._queue.append(record)
+        if len(self._queue) >= self._batch_size:
+            self._wakeup.set()
+        return True
+
+    def flush(self, timeout: Optional[float] = 5.0) -> bool:
+        """Block until every record submitted before this call is written."""
+        if not self._thread.is_alive():
+            self._drain()
+            return True
+
+        done = threading.Event()
+        self._flush_waiters.append(done)
+        self._wakeup.set()
+        return done.wait(timeout)
+
+    def close(self) -> None:
+        """Write the pending records and stop the writer thread."""
+        if not self._running:
+            return
+        self._running = False
+        self._wakeup.set()
+        self._thread.join(timeout=5.0)
+        self._drain()
+        self._store.close()
+        for waiter in self._flush_waiters:
+            waiter.set()
+
+    def _run(self) -> None:
+        while self._running:
+            self._wakeup.wait(self._flush_interval)
+            self._wakeup.clear()
+            waiters, self._flush_waiters = self._flush_waiters, []
+            try:
+                self._drain()
+            except Exception as e:
+                print(f"[{self.__class__.__name__}] write failed: {type(e).__name__}: {e}")
+            finally:
+                for waiter in waiters:
+                    waiter.set()
+
+    def _drain(self) -> None:
+        while self._queue:
+            batch = []
+            while self._queue and len(batch) < self._batch_size:
+                item = self._queue.popleft()
+                batch.append(_as_record(item))
+
+            dropped = self._dropped
+            if dropped != self._reported_dropped and self._drop_notice:
+                batch.append(_as_record(self._drop_notice(dropped - self._reported_dropped)))
+            self._reported_dropped = dropped
+
+            self._store.append_many(batch)
@@ -0,0 +1,340 @@
+import gzip
+import json
+import os
+import shutil
+import threading
+import time
+from enum import Enum
+from pathlib import Path
+from typing import IO, Iterable, Iterator, Optional, Union
+
+import numpy as np
+
+from .log_index import INDEX_DTYPE, LogIndex, record_timestamp, role_code
+from .log_page import LogPage
+from .log_segment import LogSegment
+
+
+class FsyncPolicy(str, Enum):
+    """When appended records are forced to stable storage."""
+
+    NEVER = "never"
+    INTERVAL = "interval"
+    ALWAYS = "always"
+
+
+class JsonlLogStore:
+    """
+    Append-only log store writing one JSON record per line.
+
+    Appending a record is O(1): the file is kept open in append mode and
+    never re-read on the write path. A LogIndex kept alongside the file lets
+    `query` read only the records it returns.
+
+    Records go to the active segment (``path``). Once it exceeds
+    max_segment_size bytes or holds records older than max_segment_age
+    seconds, it is sealed into ``<stem>.<first cursor>.jsonl.gz`` and a new
+    active segment is started. Sealed segments beyond the retention limits
+    are deleted. Cursors keep increasing across rotations; the cursor of the
+    active segment's first record is kept in ``<path>.meta``.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        fsync_policy: Union[FsyncPolicy, str] = FsyncPolicy.INTERVAL,
+        fsync_interval: float = 5.0,
+        max_segment_size: Optional[int] = None,
+        max_segment_age: Optional[float] = None,
+        retention_segments: Optional[int] = None,
+        retention_age: Optional[float] = None,
+    ):
+        """
+        Args:
+            path: Path of the active .jsonl file.
+            fsync_policy: When to fsync the file after appending.
+            fsync_interval: Minimum number of seconds between two fsyncs with the "interval" policy.
+            max_segment_size: Size in bytes past which the active segment is sealed (None: never).
+            max_segment_age: Age in seconds of its first record past which the active segment is sealed (None: never).
+            retention_segments: Maximum number of sealed segments kept (None: no limit).
+            retention_age: Sealed segments whose last record is older than this many seconds are deleted (None: no limit).
+        """
+        self._path = Path(path)
+        self._fsync_policy = FsyncPolicy(fsync_policy)
+        self._fsync_interval = fsync_interval
+        self._max_segment_size = max_segment_size
+        self._max_segment_age = max_segment_age
+        self._retention_segments = retention_segments
+        self._retention_age = retention_age
+        self._file: Optional[IO[bytes]] = None
+        self._last_fsync = 0.0
+        self._lock = threading.Lock()
+
+        self._meta_path = self._path.with_name(self._path.name + ".meta")
+        sealed = self._load_sealed_segments()
+        base = self._read_base()
+        if sealed and sealed[-1].end > base:
+            # Interrupted rotation: the active segment was sealed but not yet cleared
+            base = sealed[-1].end
+            self._write_base(base)
+            self._path.unlink(missing_ok=True)
+            LogIndex.index_path(self._path).unlink(missing_ok=True)
+        self._sealed: tuple[LogSegment, ...] = tuple(sealed)
+        self._active = LogSegment(self._path, base=base)
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    @property
+    def next_cursor(self) -> int:
+        """Cursor of the next record to be appended."""
+        return self._active.end
+
+    @property
+    def segments(self) -> tuple[LogSegment, ...]:
+        """Sealed segments, oldest first, followed by the active one."""
+        return self._sealed + (self._active,)
+
+    def append(self, record: dict) -> None:
+        """Append a single record at the end of the file."""
+        self.append_many([record])
+
+    def append_many(self, records: list[dict]) -> None:
+        """Append several records with a single write (and at most one fsync)."""
+        if not records:
+            return
+        lines = [(json.dumps(r, ensure_ascii=False) + "\n").encode("utf-8") for r in records]
+        with self._lock:
+            f = self._open()
+            entries = self._index_entries(f.tell(), records, lines)
+            f.write(b"".join(lines))
+            f.flush()
+            self._maybe_fsync(f)
+            self._active.index.append(entries)
+            if self._should_rotate():
+                self._rotate()
+
+    def iter_records(self) -> Iterator[dict]:
+        """Yield records of every segment in order, decompressing sealed segments on the fly."""
+        for segment in self.segments:
+            yield from segment.iter_records()
+
+    def read_all(self) -> list:
+        with self._lock:
+            return list(self.iter_records())
+
+    def query(
+        self,
+        cursor: Optional[int] = None,
+        since: Optional[float] = None,
+        roles: Optional[Iterable[str]] = None,
+        limit: int = 100,
+        offset: int = 0,
+        tail: bool = False,
+    ) -> LogPage:
+        """
+        Select records through the segment indexes and read only those.
+
+        Args:
+            cursor: Only records at or after this cursor (a previous page's next_cursor).
+            since: Only records with a timestamp strictly after this epoch time.
+            roles: Only records with one of these roles.
+            limit: Maximum number of records returned.
+            offset: Number of matching records to skip, from the start (or from the end with tail).
+            tail: Return the last matching records instead of the first ones.
+
+        Each returned record carries its own ``cursor``. Appends wait while the
+        selected records are read.
+        """
+        codes = [role_code(r) for r in roles] if roles is not None else None
+        # Under the lock: a rotation would truncate the active file between reading its index and its records
+        with self._lock:
+            segments = self.segments
+            matches = []
+            for segment in segments:
+                entries = segment.index.entries
+                start = 0
+                if cursor is not None:
+                    start = max(start, min(cursor - segment.base, len(entries)))
+                if since is not None:
+                    # Records are appended in timestamp order
+                    start = max(start, int(np.searchsorted(entries["timestamp"], since, side="right")))
+                positions = np.arange(start, len(entries))
+                if codes is not None:
+                    positions = positions[np.isin(entries["role"][start:], codes)]
+                matches.append(positions)
+
+            total = sum(len(positions) for positions in matches)
+            if tail:
+                end = max(0, total - offset)
+                first, last = max(0, end - limit), end
+            else:
+                first, last = offset, min(total, offset + limit)
+
+            records = []
+            seen = 0
+            for segment, positions in zip(segments, matches):
+                selected = positions[max(0, first - seen):max(0, last - seen)]
+                seen += len(positions)
+                records.extend(segment.read(segment.index.entries, selected))
+
+            next_cursor = records[-1]["cursor"] + 1 if records else segments[-1].end
+
+        return LogPage(records=records, next_cursor=next_cursor, total=total)
+
+    def rotate(self) -> None:
+        """Seal the active segment now."""
+        with self._lock:
+            self._rotate()
+
+    def reset(self) -> None:
+        """Drop every record, sealed segments included."""
+        with self._lock:
+            self._close()
+            for segment in self._sealed:
+                segment.delete()
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self._path, "wb"):
+                pass
+            self._write_base(0)
+            self._sealed = ()
+            self._active = LogSegment(self._path, base=0)
+
+    def close(self) -> None:
+        with self._lock:
+            self._close()
+
+    def migrate_legacy(self, legacy_path: Union[str, Path]) -> int:
+        """
+        Import the records of a legacy ``logs.json`` array file.
+
+        The legacy file is renamed with a ``.migrated`` suffix so the migration runs once.
+
+        Returns:
+            Number of migrated records.
+        """
+        legacy_path = Path(legacy_path)
+        try:
+            with open(legacy_path, "r") as f:
+                records = json.load(f)
+        except FileNotFoundError:
+            return 0
+        except json.JSONDecodeError:
+            records = []
+
+        if not isinstance(records, list):
+            records = []
+
+        records = [r for r in records if isinstance(r, dict)]
+        self.append_many(records)
+        with self._lock:
+            if self._file is not None:
+                os.fsync(self._file.fileno())
+
+        legacy_path.replace(legacy_path.with_name(legacy_path.name + ".migrated"))
+        return len(records)
+
+    def _should_rotate(self) -> bool:
+        active = self._active
+        if len(active) == 0:
+            return False
+        if self._max_segment_size is not None and active.size >= self._max_segment_size:
+            return True
+        if self._max_segment_age is not None and time.time() - active.first_timestamp >= self._max_segment_age:
+            return True
+        return False
+
+    def _rotate(self) -> None:
+        active = self._active
+        if len(active) == 0:
+            return
+        self._close()
+
+        # Compress and move the index first: a crash before the base is updated is repaired on startup
+        sealed_path = self._sealed_path(active.base)
+        tmp_path = sealed_path.with_name(sealed_path.name + ".tmp")
+        with open(active.path, "rb") as src, gzip.open(tmp_path, "wb") as dst:
+            shutil.copyfileobj(src, dst)
+        os.replace(active.index.path, LogIndex.index_path(sealed_path))
+        os.replace(tmp_path, sealed_path)
+        self._write_base(active.end)
+        with open(active.path, "wb"):
+            pass
+
+        self._sealed = self._sealed + (LogSegment(sealed_path, base=active.base, sealed=True),)
+        self._active = LogSegment(self._path, base=active.end)
+        self._apply_retention()
+
+    def _apply_retention(self) -> None:
+        sealed = list(self._sealed)
+        expired = []
+        if self._retention_segments is not None:
+            while len(sealed) > self._retention_segments:
+                expired.append(sealed.pop(0))
+        if self._retention_age is not None:
+            cutoff = time.time() - self._retention_age
+            while sealed and (sealed[0].last_timestamp or 0) < cutoff:
+                expired.append(sealed.pop(0))
+
+        self._sealed = tuple(sealed)
+        for segment in expired:
+            segment.delete()
+
+    def _sealed_path(self, base: int) -> Path:
+        return self._path.with_name(f"{self._path.stem}.{base:010d}{self._path.suffix}.gz")
+
+    def _load_sealed_segments(self) -> list[LogSegment]:
+        segments = []
+        for path in self._path.parent.glob(f"{self._path.stem}.*{self._path.suffix}.gz"):
+            base = path.name[len(self._path.stem) + 1:-len(self._path.suffix) - 3]
+            if base.isdigit():
+                segments.append(LogSegment(path, base=int(base), sealed=True))
+        return sorted(segments, key=lambda s: s.base)
+
+    def _read_base(self) -> int:
+        try:
+            with open(self._meta_path, "r") as f:
+                return int(json.load(f)["base"])
+        except (FileNotFoundError, json.JSONDecodeError, KeyError, TypeError, ValueError):
+            return 0
+
+    def _write_base(self, base: int) -> None:
+        self._meta_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self._meta_path.with_name(self._meta_path.name + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump({"base": base}, f)
+        os.replace(tmp_path, self._meta_path)
+
+    @staticmethod
+    def _index_entries(offset: int, records: list[dict], lines: list[bytes]) -> np.ndarray:
+        entries = np.empty(len(records), dtype=INDEX_DTYPE)
+        for i, (record, line) in enumerate(zip(records, lines)):
+            entries[i] = (offset, len(line), record_timestamp(record), role_code(record.get("role")))
+            offset += len(line)
+        return entries
+
+    def _open(self) -> IO[bytes]:
+        if self._file is None:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self._path, "ab")
+        return self._file
+
+    def _close(self) -> None:
+        if self._file is not None:
+            try:
+                self._file.flush()
+                if self._fsync_policy != FsyncPolicy.NEVER:
+                    os.fsync(self._file.fileno())
+            finally:
+                self._file.close()
+                self._file = None
+
+    def _maybe_fsync(self, f: IO[bytes]) -> None:
+        if self._fsync_policy == FsyncPolicy.ALWAYS:
+            os.fsync(f.fileno())
+        elif self._fsync_policy == FsyncPolicy.INTERVAL:
+            now = time.monotonic()
+            if now - self._last_fsync >= self._fsync_interval:
+                os.fsync(f.fileno())
+                self._last_fsync = now
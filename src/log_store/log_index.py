@@ -0,0 +1,150 @@
+import gzip
+import json
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, Union
+
+import numpy as np
+
+# One fixed-size entry per record of the .jsonl file
+INDEX_DTYPE = np.dtype([
+    ("offset", "<u8"),
+    ("length", "<u4"),
+    ("timestamp", "<f8"),
+    ("role", "u1"),
+])
+
+ROLES = ["app", "error", "user", "assistant", "tool", "system"]
+_ROLE_CODES = {role: code for code, role in enumerate(ROLES)}
+UNKNOWN_ROLE = 255
+
+
+def role_code(role: Optional[str]) -> int:
+    return _ROLE_CODES.get(role, UNKNOWN_ROLE)
+
+
+def record_timestamp(record: dict) -> float:
+    """Epoch seconds of a record's ISO timestamp, or now if it has none."""
+    try:
+        return datetime.fromisoformat(record["timestamp"]).timestamp()
+    except (KeyError, TypeError, ValueError):
+        return time.time()
+
+
+class LogIndex:
+    """
+    Offset index of a .jsonl log file, persisted next to it as ``<file>.idx``.
+
+    Entry ``i`` holds the byte offset, length, timestamp and role of record ``i``
+    so queries can select records and read them with one seek each, without
+    parsing the log file. Entries are mirrored in memory; the file only saves
+    a full rescan of the log on startup.
+
+    For a gzip-compressed log, offsets refer to the uncompressed stream.
+    """
+
+    def __init__(self, log_path: Union[str, Path], compressed: bool = False):
+        self._log_path = Path(log_path)
+        self._path = self.index_path(self._log_path)
+        self._compressed = compressed
+        self._entries = np.zeros(1024, dtype=INDEX_DTYPE)
+        self._count = 0
+        self._load()
+
+    @staticmethod
+    def index_path(log_path: Union[str, Path]) -> Path:
+        log_path = Path(log_path)
+        return log_path.with_name(log_path.name + ".idx")
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def data_size(self) -> int:
+        """Size in bytes of the indexed part of the log file."""
+        if self._count == 0:
+            return 0
+        last = self._entries[self._count - 1]
+        return int(last["offset"]) + int(last["length"])
+
+    @property
+    def entries(self) -> np.ndarray:
+        """Read-only view of the current entries."""
+        view = self._entries[:self._count]
+        view.flags.writeable = False
+        return view
+
+    def append(self, entries: np.ndarray) -> None:
+        """Add entries in memory and append them to the index file."""
+        self._extend(entries)
+        with open(self._path, "ab") as f:
+            f.write(entries.tobytes())
+
+    def reset(self) -> None:
+        self._count = 0
+        with open(self._path, "wb"):
+            pass
+
+    def rebuild(self) -> None:
+        """Recreate the index by scanning the log file once."""
+        entries = []
+        offset = 0
+        try:
+            opener = gzip.open if self._compressed else open
+            with opener(self._log_path, "rb") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        record = None
+                    if isinstance(record, dict):
+                        entries.append((offset, len(line), record_timestamp(record), role_code(record.get("role"))))
+                    offset += len(line)
+        except FileNotFoundError:
+            pass
+
+        self._count = 0
+        self._extend(np.array(entries, dtype=INDEX_DTYPE))
+        with open(self._path, "wb") as f:
+            f.write(self.entries.tobytes())
+
+    def _load(self) -> None:
+        try:
+            raw = self._path.read_bytes()
+            # Ignore a partially written trailing entry, the size check below rebuilds the index anyway
+            entries = np.frombuffer(raw, dtype=INDEX_DTYPE, count=len(raw) // INDEX_DTYPE.itemsize)
+        except FileNotFoundError:
+            entries = None
+
+        if entries is not None:
+            self._extend(entries)
+
+        if self._compressed:
+            # Sealed logs never change, a complete index can be trusted as is
+            if entries is None:
+                self.rebuild()
+            return
+
+        try:
+            log_size = os.path.getsize(self._log_path)
+        except FileNotFoundError:
+            log_size = 0
+
+        # A crash between the log and the index writes leaves them out of sync
+        if entries is None or self.data_size != log_size:
+            self.rebuild()
+
+    def _extend(self, entries: np.ndarray) -> None:
+        needed = self._count + len(entries)
+        if needed > len(self._entries):
+            grown = np.zeros(max(needed, 2 * len(self._entries)), dtype=INDEX_DTYPE)
+            grown[:self._count] = self._entries[:self._count]
+            self._entries = grown
+        self._entries[self._count:needed] = entries
+        self._count = needed
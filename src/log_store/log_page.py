@@ -0,0 +1,12 @@
+from dataclasses import dataclass, field
+
+
+@dataclass
+class LogPage:
+    """One page of a log query."""
+
+    records: list = field(default_factory=list)
+    # Pass back as `cursor` to get the records written after this page
+    next_cursor: int = 0
+    # Number of records matching the filters, before limit/offset
+    total: int = 0
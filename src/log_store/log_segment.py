@@ -0,0 +1,91 @@
+import gzip
+import json
+from pathlib import Path
+from typing import IO, Iterator, Optional, Union
+
+import numpy as np
+
+from .log_index import LogIndex
+
+
+class LogSegment:
+    """
+    One .jsonl log file and its index, covering cursors ``[base, base + len(segment))``.
+
+    Sealed segments are gzip-compressed and read-only; only the active segment grows.
+    """
+
+    def __init__(self, path: Union[str, Path], base: int, sealed: bool = False):
+        self.path = Path(path)
+        self.base = base
+        self.sealed = sealed
+        self.index = LogIndex(self.path, compressed=sealed)
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    @property
+    def end(self) -> int:
+        """Cursor following the last record of the segment."""
+        return self.base + len(self.index)
+
+    @property
+    def size(self) -> int:
+        """Uncompressed size of the indexed records, in bytes."""
+        return self.index.data_size
+
+    @property
+    def first_timestamp(self) -> Optional[float]:
+        entries = self.index.entries
+        return float(entries["timestamp"][0]) if len(entries) else None
+
+    @property
+    def last_timestamp(self) -> Optional[float]:
+        entries = self.index.entries
+        return float(entries["timestamp"][-1]) if len(entries) else None
+
+    def open(self) -> IO[bytes]:
+        return gzip.open(self.path, "rb") if self.sealed else open(self.path, "rb")
+
+    def iter_records(self) -> Iterator[dict]:
+        """Yield records in file order, skipping lines that cannot be parsed (e.g. a torn last write)."""
+        try:
+            with self.open() as f:
+                for line in f:
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+        except FileNotFoundError:
+            return
+
+    def read(self, entries: np.ndarray, positions: np.ndarray) -> list:
+        """
+        Read the records at the given (ascending) local positions.
+
+        Positions are read in order so a compressed segment is decompressed
+        in a single forward pass, up to the last requested record only.
+        """
+        records = []
+        if len(positions) == 0:
+            return records
+        try:
+            with self.open() as f:
+                for position in positions:
+                    entry = entries[position]
+                    f.seek(int(entry["offset"]))
+                    try:
+                        record = json.loads(f.read(int(entry["length"])))
+                    except json.JSONDecodeError as e:
+                        raise RuntimeError(
+                            f"{self.path}: no record at offset {int(entry['offset'])}, the index does not match the file"
+                        ) from e
+                    record["cursor"] = self.base + int(position)
+                    records.append(record)
+        except FileNotFoundError:
+            pass
+        return records
+
+    def delete(self) -> None:
+        self.path.unlink(missing_ok=True)
+        self.index.path.unlink(missing_ok=True)
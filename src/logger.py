@@ -1,5 +1,8 @@
-import json
+from datetime import datetime
+from typing import Iterable, Optional
+
 from config import Config
+from log_store import JsonlLogStore, BackgroundLogWriter, LogPage
 from models.logs import LogMessage, AppMessage, ErrorMessage, ConversationMessage
 
 # Re-export for backwards compatibility
@@ -10,24 +13,88 @@ class Logger:
 
     def __init__(self, log_file: str = None):
         self._log_file = str(log_file or Config.LOGS_FILE)
+        self._store = JsonlLogStore(
+            self._log_file,
+            fsync_policy=Config.LOGS_FSYNC_POLICY,
+            fsync_interval=Config.LOGS_FSYNC_INTERVAL,
+            max_segment_size=Config.LOGS_MAX_SEGMENT_SIZE,
+            max_segment_age=Config.LOGS_MAX_SEGMENT_AGE,
+            retention_segments=Config.LOGS_RETENTION_SEGMENTS,
+            retention_age=Config.LOGS_RETENTION_AGE,
+        )
+        if log_file is None and Config.LEGACY_LOGS_FILE.exists():
+            self._store.migrate_legacy(Config.LEGACY_LOGS_FILE)
+        self._writer = BackgroundLogWriter(
+            self._store,
+            max_queue_size=Config.LOGS_QUEUE_SIZE,
+            overflow_policy=Config.LOGS_OVERFLOW_POLICY,
+            drop_notice=lambda count: ErrorMessage(content=f"Logger: {count} log records dropped, writer queue full"),
+        )
+
+    @property
+    def dropped(self) -> int:
+        """Number of log records lost because the writer queue was full."""
+        return self._writer.dropped
 
     def get_json_file(self) -> list:
+        self._writer.flush()
+        return self._store.read_all()
+
+    @property
+    def next_cursor(self) -> int:
+        """Cursor the next written record will get."""
+        return self._store.next_cursor
+
+    def query(
+        self,
+        cursor: Optional[int] = None,
+        since: Optional[str] = None,
+        roles: Optional[Iterable[str]] = None,
+        limit: int = 100,
+        offset: int = 0,
+        tail: bool = False,
+    ) -> LogPage:
+        """
+        Query written records through the log index.
+
+        Args:
+            since: ISO timestamp or epoch seconds; only records strictly after it are returned.
+
+        See JsonlLogStore.query for the other arguments.
+        """
+        return self._store.query(
+            cursor=cursor,
+            since=self._parse_since(since),
+            roles=roles,
+            limit=limit,
+            offset=offset,
+            tail=tail,
+        )
+
+    @staticmethod
+    def _parse_since(since: Optional[str]) -> Optional[float]:
+        if since is None:
+            return None
         try:
-            with open(self._log_file, 'r') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
+            return float(since)
+        except ValueError:
+            return datetime.fromisoformat(since).timestamp()
 
     def log(self, message: LogMessage):
-        logs = self.get_json_file()
-        logs.append(message.model_dump())
+        """Enqueue the message; the background writer persists it."""
+        self._writer.submit(message)
+
+    def flush(self):
+        self._writer.flush()
 
-        with open(self._log_file, 'w') as f:
-            json.dump(logs, f, indent=4)
+    def rotate(self):
+        """Seal the active log segment once the records written so far are in it."""
+        self._writer.flush()
+        self._store.rotate()
 
     def reset(self):
-        with open(self._log_file, 'w') as f:
-            json.dump([], f)
+        self._writer.flush()
+        self._store.reset()
 
 
 logger = Logger()
@@ -8,6 +8,8 @@ class ToolParameter(BaseModel):
     type: str
     required: bool = False
     enum: Optional[list[str]] = None
+    # Schema of the elements when type is "array"
+    items: Optional[dict] = None
 
     @property
     def json_definition(self) -> dict:
@@ -17,4 +19,6 @@ class ToolParameter(BaseModel):
         }
         if self.enum:
             definition["enum"] = self.enum
+        if self.items:
+            definition["items"] = self.items
         return definition
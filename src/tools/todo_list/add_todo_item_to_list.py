@@ -1,4 +1,3 @@
-from .entities.todo_list import TodoList
 from .todo_tool import TodoTool
 from models.tools import ToolParameter
 from logger import logger, ErrorMessage
@@ -20,8 +19,10 @@ class AddTodoItemToList(TodoTool):
 
     def execute(self, list_name: str, item_name: str):
         try:
-            todo_list: TodoList = self._get_todo_list_from_name(list_name)
-            return todo_list.add_item(self._get_access_token(), item_name)
+            return self._with_todo_list(
+                list_name,
+                lambda todo_list: todo_list.add_item(self._get_access_token(), item_name),
+            )
 
         except Exception as e:
             logger.log(ErrorMessage(content=f"{self.__class__.__name__} : get_todo_list_items: {e}"))
@@ -3,6 +3,10 @@ import requests
 from tools.todo_list.entities.items import TodoItem
 from logger import ErrorMessage, AppMessage, logger
 
+class TodoListNotFound(Exception):
+    """The list does not exist anymore (Graph answered 404)."""
+
+
 class TodoList:
 
     def __init__(self, display_name: str, id: str, is_owner: bool, is_shared: bool):
@@ -59,11 +63,15 @@ class TodoList:
         try:
             logger.log(AppMessage(content=f"Get items from {self.display_name}"))
             response = requests.get(self._url, headers=self.__get_headers(access_token))
+            if response.status_code == 404:
+                raise TodoListNotFound(f"{self.display_name} ({self.id}) not found")
             response.raise_for_status()
 
             items = response.json()['value']
             return [TodoItem.from_json(item) for item in items]
 
+        except TodoListNotFound:
+            raise
         except Exception as e:
             logger.log(ErrorMessage(content=f"{self.__class__.__name__} : __get_items: {e}"))
             raise Exception(f"{self.__class__.__name__} : __get_items: {e}")
@@ -82,8 +90,12 @@ class TodoList:
             }
 
             response = requests.post(self._url, headers=self.__get_headers(access_token), json=payload)
+            if response.status_code == 404:
+                raise TodoListNotFound(f"{self.display_name} ({self.id}) not found")
             response.raise_for_status()
             return f"{item_name} added to {self.display_name}"
+        except TodoListNotFound:
+            raise
         except Exception as e:
             logger.log(ErrorMessage(content=f"{self.__class__.__name__} : __add_item: {e}"))
             raise Exception(f"{self.__class__.__name__} : __add_item: {e}")
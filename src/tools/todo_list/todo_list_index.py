@@ -0,0 +1,75 @@
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Union
+
+from logger import logger, ErrorMessage
+from .entities.todo_list import TodoList
+
+
+class TodoListIndex:
+    """
+    Cache of the user's todo lists by lowercase display name, valid for `ttl` seconds.
+
+    The raw Graph payload is kept (and optionally persisted as JSON), so a cold
+    start reuses the lists fetched by the previous run while they are fresh.
+    """
+
+    def __init__(self, ttl: float, path: Optional[Union[str, Path]] = None):
+        self._ttl = ttl
+        self._path = Path(path) if path else None
+        self._lock = threading.Lock()
+        self._lists: dict[str, TodoList] = {}
+        self._fetched_at = 0.0
+        self._load()
+
+    @property
+    def is_fresh(self) -> bool:
+        return time.time() - self._fetched_at < self._ttl
+
+    def get(self, name: str) -> Optional[TodoList]:
+        """The list named `name` (case-insensitive), or None if unknown or the index is stale."""
+        with self._lock:
+            if not self.is_fresh:
+                return None
+            return self._lists.get(name.lower())
+
+    def update(self, todo_lists: list[dict]) -> None:
+        """Replace the index with the `value` of a GET /me/todo/lists response."""
+        with self._lock:
+            self._lists = {item['displayName'].lower(): TodoList.from_json(item) for item in todo_lists}
+            self._fetched_at = time.time()
+            self._save(todo_lists)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._fetched_at = 0.0
+            if self._path and self._path.exists():
+                try:
+                    self._path.unlink()
+                except Exception as e:
+                    logger.log(ErrorMessage(content=f"{self.__class__.__name__} : invalidate: {e}"))
+
+    def _load(self) -> None:
+        if not self._path or not self._path.exists():
+            return
+        try:
+            with open(self._path) as f:
+                data = json.load(f)
+            self._lists = {item['displayName'].lower(): TodoList.from_json(item) for item in data['lists']}
+            self._fetched_at = data['fetched_at']
+        except Exception as e:
+            logger.log(ErrorMessage(content=f"{self.__class__.__name__} : _load: {e}"))
+
+    def _save(self, todo_lists: list[dict]) -> None:
+        if not self._path:
+            return
+        try:
+            tmp_path = self._path.with_suffix(self._path.suffix + ".tmp")
+            with open(tmp_path, 'w') as f:
+                json.dump({'fetched_at': self._fetched_at, 'lists': todo_lists}, f, indent=4)
+            os.replace(tmp_path, self._path)
+        except Exception as e:
+            logger.log(ErrorMessage(content=f"{self.__class__.__name__} : _save: {e}"))
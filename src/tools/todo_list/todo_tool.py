@@ -1,20 +1,28 @@
 import time
 from abc import ABC
 import json
+from typing import Callable, TypeVar
 
 import requests
 from requests_oauthlib import OAuth2Session
 import os
 
 from config import Config
-from .entities.todo_list import TodoList
+from logger import logger, AppMessage
+from .entities.todo_list import TodoList, TodoListNotFound
+from .todo_list_index import TodoListIndex
 from ..tool import Tool
 
 os.environ['OAUTHLIB_RELAX_TOKEN_SCOPE'] = '1'  # https://github.com/VannTen/oauth2token/issues/5
 
+T = TypeVar('T')
+
 
 class TodoTool(Tool, ABC):
 
+    # Shared by every TodoTool: a list name costs one GET /me/todo/lists per TTL, not one per call
+    _list_index = TodoListIndex(Config.TODO_LISTS_TTL, Config.TODO_LISTS_CACHE_FILE)
+
     def __init__(self):
         try:
             self.token_file = Config.TOKEN_FILE
@@ -49,7 +57,7 @@ class TodoTool(Tool, ABC):
         except Exception as e:
             raise Exception(f"__refresh_token: {e}")
 
-    def _get_todo_list_from_name(self, name):
+    def _fetch_todo_lists(self) -> None:
         try:
             token = self._get_access_token()
             graph_url = 'https://graph.microsoft.com/v1.0/me/todo/lists'
@@ -61,13 +69,30 @@ class TodoTool(Tool, ABC):
             response = requests.get(graph_url, headers=headers)
             response.raise_for_status()
 
-            todo_lists = response.json()['value']
+            self._list_index.update(response.json()['value'])
+            logger.log(AppMessage(content=f"{self.__class__.__name__}: todo lists fetched"))
+        except Exception as e:
+            raise Exception(f"_fetch_todo_lists: {e}")
 
-            todo_list = next((item for item in todo_lists if item['displayName'].lower() == name), None)
+    def _get_todo_list_from_name(self, name):
+        try:
+            todo_list = self._list_index.get(name)
+            if todo_list is None:
+                # Stale index, or a list created since it was fetched
+                self._fetch_todo_lists()
+                todo_list = self._list_index.get(name)
 
             if todo_list is None:
                 raise Exception(f"Could not find list with name: {name}")
 
-            return TodoList.from_json(todo_list)
+            return todo_list
         except Exception as e:
-            raise Exception(f"{self.__class__.__name__} : _get_todo_list_from_name: {e}")
\ No newline at end of file
+            raise Exception(f"{self.__class__.__name__} : _get_todo_list_from_name: {e}")
+
+    def _with_todo_list(self, name: str, action: Callable[[TodoList], T]) -> T:
+        """Run `action` on the list named `name`; if the cached list is gone (404), refetch the lists and retry once."""
+        try:
+            return action(self._get_todo_list_from_name(name))
+        except TodoListNotFound:
+            self._list_index.invalidate()
+            return action(self._get_todo_list_from_name(name))
@@ -1,10 +1,13 @@
 from tools.todo_list.add_todo_item_to_list import AddTodoItemToList
 from tools.weather.check_weather import CheckWeather
+from tools.weather.check_weather_batch import CheckWeatherBatch
 
 add_todo_item_to_list = AddTodoItemToList()
 check_weather = CheckWeather()
+check_weather_batch = CheckWeatherBatch()
 
 tools = {
     add_todo_item_to_list.tool_name: add_todo_item_to_list,
     check_weather.tool_name: check_weather,
+    check_weather_batch.tool_name: check_weather_batch,
 }
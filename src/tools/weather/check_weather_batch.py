@@ -0,0 +1,66 @@
+from datetime import date, timedelta
+
+from logger import logger, ErrorMessage
+from .weather_formatter import format_summary
+from .weather_tool import WeatherTool
+from models.tools import ToolParameter
+
+class CheckWeatherBatch(WeatherTool):
+
+	# open-meteo forecasts go 16 days ahead
+	MAX_DAYS = 16
+
+	@property
+	def tool_name(self) -> str:
+		return "check_weather_batch"
+
+	@property
+	def description(self) -> str:
+		return ("Check the weather in several cities over several days at once (e.g. this weekend in Lyon and in the family's city). "
+				"Prefer it to several check_weather calls.")
+
+	@property
+	def parameters(self) -> list[ToolParameter]:
+		return [
+			ToolParameter(name="cities", description="The names of the cities", type="array", required=True, items={"type": "string"}),
+			ToolParameter(name="start_date", description=f"First day - format YYYY-MM-DD. Today we are {date.today().strftime('%Y-%m-%d')}", type="string", required=True),
+			ToolParameter(name="end_date", description="Last day (included) - format YYYY-MM-DD", type="string", required=True),
+		]
+
+	def execute(self, cities: list[str], start_date: str, end_date: str):
+		try:
+			first, last = date.fromisoformat(start_date), date.fromisoformat(end_date)
+			if last < first:
+				raise Exception(f"end_date {end_date} is before start_date {start_date}")
+			if last - first >= timedelta(days=self.MAX_DAYS):
+				raise Exception(f"At most {self.MAX_DAYS} days at once")
+
+			coordinates = []
+			unknown = []
+			for city in cities:
+				try:
+					city_coordinates = self._get_coordinates(city)
+				except Exception as e:
+					# One city failing to geocode (e.g. Nominatim down) doesn't spoil the others
+					logger.log(ErrorMessage(content=f"{self.__class__.__name__} : _get_coordinates: {city}: {e}"))
+					city_coordinates = None
+				if city_coordinates is None:
+					unknown.append(city)
+				else:
+					coordinates.append((city, city_coordinates))
+			# Cities resolving to the same place are only fetched once
+			locations = list(dict.fromkeys(city_coordinates for _, city_coordinates in coordinates))
+			forecasts = dict(zip(locations, self._get_forecasts(locations, start_date, end_date)))
+
+			lines = ["Weather (local time):"]
+			for city, city_coordinates in coordinates:
+				lines.append(f"{city}:")
+				days = forecasts[city_coordinates]
+				for day in sorted(days):
+					lines.append(format_summary(*days[day]).rstrip("\n"))
+			if unknown:
+				lines.append(f"Unknown cities: {', '.join(unknown)}")
+			return "\n".join(lines)
+		except Exception as e:
+			logger.log(ErrorMessage(content=f"{self.__class__.__name__} : check_weather_batch: {e}"))
+			raise Exception(f"{self.__class__.__name__} : check_weather_batch: {e}")
@@ -0,0 +1,64 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+from config import Config
+
+
+class ForecastCache:
+	"""
+	In-memory LRU cache of forecasts whose entries expire `ttl` seconds after being stored.
+
+	Keys are built with key(): coordinates rounded to ~1 km, so the same city
+	geocoded slightly differently still hits.
+	"""
+
+	def __init__(self, max_size: int = 64, ttl: float = 1800):
+		self._max_size = max_size
+		self._ttl = ttl
+		self._entries: OrderedDict = OrderedDict()
+		self._lock = threading.Lock()
+		self.hits = 0
+		self.misses = 0
+		self.expirations = 0
+		self.evictions = 0
+
+	@staticmethod
+	def key(latitude: float, longitude: float, *rest: Hashable) -> tuple:
+		return (round(latitude, 2), round(longitude, 2), *rest)
+
+	def get(self, key: tuple) -> Optional[Any]:
+		with self._lock:
+			entry = self._entries.get(key)
+			if entry is not None:
+				expires_at, value = entry
+				if expires_at > time.monotonic():
+					self._entries.move_to_end(key)
+					self.hits += 1
+					return value
+				del self._entries[key]
+				self.expirations += 1
+			self.misses += 1
+			return None
+
+	def put(self, key: tuple, value: Any) -> None:
+		with self._lock:
+			self._entries[key] = (time.monotonic() + self._ttl, value)
+			self._entries.move_to_end(key)
+			while len(self._entries) > self._max_size:
+				self._entries.popitem(last=False)
+				self.evictions += 1
+
+	def clear(self) -> None:
+		with self._lock:
+			self._entries.clear()
+
+	def stats(self) -> str:
+		return (
+			f"size={len(self._entries)}/{self._max_size}, hits={self.hits}, misses={self.misses}, "
+			f"expirations={self.expirations}, evictions={self.evictions}"
+		)
+
+
+forecast_cache = ForecastCache(Config.WEATHER_FORECAST_CACHE_SIZE, Config.WEATHER_FORECAST_TTL)
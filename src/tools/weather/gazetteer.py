@@ -0,0 +1,190 @@
+import csv
+import difflib
+import unicodedata
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Union
+
+from config import Config
+from logger import logger, ErrorMessage, AppMessage
+
+# Accepted CSV column names (e.g. the French communes files of data.gouv.fr)
+NAME_COLUMNS = ("name", "nom", "nom_standard", "nom_commune", "nom_commune_complet", "city")
+LATITUDE_COLUMNS = ("latitude", "lat", "latitude_centre", "latitude_mairie")
+LONGITUDE_COLUMNS = ("longitude", "lon", "lng", "longitude_centre", "longitude_mairie")
+POPULATION_COLUMNS = ("population", "pop")
+
+ABBREVIATIONS = {"st": "saint", "ste": "sainte"}
+
+
+def _column(columns: dict[str, str], candidates: tuple[str, ...], required: bool = True) -> Optional[str]:
+	column = next((columns[c] for c in candidates if c in columns), None)
+	if column is None and required:
+		raise ValueError(f"no column among {', '.join(candidates)}")
+	return column
+
+
+def normalize(name: str) -> str:
+	"""Lowercase, no accents, no punctuation: "Saint-Étienne" and "st etienne" -> "saint etienne"."""
+	name = name.lower().replace("œ", "oe").replace("æ", "ae")
+	name = "".join(c for c in unicodedata.normalize("NFKD", name) if not unicodedata.combining(c))
+	words = "".join(c if c.isalnum() else " " for c in name).split()
+	return " ".join(ABBREVIATIONS.get(word, word) for word in words)
+
+
+class _StringTable:
+	"""Read-only sequence of strings stored as one str and an array of offsets (no per-string object)."""
+
+	def __init__(self, strings: list[str]):
+		self._text = "".join(strings)
+		self._offsets = array("I", [0])
+		for string in strings:
+			self._offsets.append(self._offsets[-1] + len(string))
+
+	def __len__(self) -> int:
+		return len(self._offsets) - 1
+
+	def __getitem__(self, index: int) -> str:
+		return self._text[self._offsets[index]:self._offsets[index + 1]]
+
+
+@dataclass
+class Place:
+	name: str
+	latitude: float
+	longitude: float
+	population: int
+	# "exact", "prefix" or "fuzzy"
+	match: str
+
+
+class Gazetteer:
+	"""
+	Offline city -> coordinates index.
+
+	Normalized names are kept sorted, so exact, accent-insensitive and prefix
+	lookups are binary searches. Fuzzy lookup (typos) only compares names with
+	the same first letter and a close length. Homonyms resolve to the most
+	populated place. Names live in two string tables and coordinates in
+	float32 arrays: a few bytes per place beyond the names themselves.
+
+	Only exact matches are certain. Prefix and fuzzy matches are candidates,
+	returned for names of at least MIN_CANDIDATE_LENGTH characters that are
+	close to the whole place name ("Montpel", "Montpelier"), never for a mere
+	common start ("Saint", "Mont").
+	"""
+
+	MAX_PREFIX_CANDIDATES = 500
+	MIN_CANDIDATE_LENGTH = 5
+	# Share of the place name a prefix must cover
+	MIN_PREFIX_COVERAGE = 0.6
+	FUZZY_CUTOFF = 0.9
+
+	def __init__(self, places: list[tuple[str, float, float, int]]):
+		"""
+		Args:
+			places: (name, latitude, longitude, population) tuples.
+		"""
+		rows = sorted((normalize(name), name, lat, lon, pop) for name, lat, lon, pop in places)
+		self._keys = _StringTable([row[0] for row in rows])
+		self._names = _StringTable([row[1] for row in rows])
+		self._latitudes = array("f", (row[2] for row in rows))
+		self._longitudes = array("f", (row[3] for row in rows))
+		self._populations = array("I", (row[4] for row in rows))
+
+	@classmethod
+	def from_csv(cls, path: Union[str, Path]) -> "Gazetteer":
+		"""Load a CSV (comma or semicolon separated) with name, latitude, longitude and optional population columns."""
+		places = []
+		try:
+			with open(path, encoding="utf-8-sig", newline="") as f:
+				header = f.readline()
+				delimiter = ";" if header.count(";") > header.count(",") else ","
+				f.seek(0)
+				reader = csv.DictReader(f, delimiter=delimiter)
+				columns = {column.strip().lower(): column for column in reader.fieldnames or []}
+				name = _column(columns, NAME_COLUMNS)
+				latitude = _column(columns, LATITUDE_COLUMNS)
+				longitude = _column(columns, LONGITUDE_COLUMNS)
+				population = _column(columns, POPULATION_COLUMNS, required=False)
+				for row in reader:
+					try:
+						places.append((
+							row[name],
+							float(row[latitude]),
+							float(row[longitude]),
+							int(float(row[population] or 0)) if population else 0,
+						))
+					except (TypeError, ValueError):
+						continue  # Places without coordinates
+		except Exception as e:
+			logger.log(ErrorMessage(content=f"{cls.__name__} : from_csv: {path}: {e}"))
+		gazetteer = cls(places)
+		logger.log(AppMessage(content=f"{cls.__name__}: {len(gazetteer)} places loaded from {path}"))
+		return gazetteer
+
+	def __len__(self) -> int:
+		return len(self._keys)
+
+	def _place(self, index: int, match: str) -> Place:
+		return Place(
+			name=self._names[index],
+			latitude=round(self._latitudes[index], 5),
+			longitude=round(self._longitudes[index], 5),
+			population=self._populations[index],
+			match=match,
+		)
+
+	def _most_populated(self, start: int, end: int) -> int:
+		return max(range(start, end), key=self._populations.__getitem__)
+
+	def lookup(self, city: str) -> Optional[Place]:
+		"""Exact, then prefix, then fuzzy match of the normalized name (see `Place.match`); None if nothing is close enough."""
+		key = normalize(city)
+		if not key:
+			return None
+		keys = self._keys
+
+		start = bisect_left(keys, key)
+		end = start
+		while end < len(keys) and keys[end] == key:
+			end += 1
+		if end > start:
+			return self._place(self._most_populated(start, end), "exact")
+
+		if len(key) < self.MIN_CANDIDATE_LENGTH:
+			return None
+
+		end = min(bisect_left(keys, key + "\uffff"), start + self.MAX_PREFIX_CANDIDATES)
+		longest = len(key) / self.MIN_PREFIX_COVERAGE
+		candidates = [index for index in range(start, end) if len(keys[index]) <= longest]
+		if candidates:
+			return self._place(max(candidates, key=self._populations.__getitem__), "prefix")
+
+		return self._fuzzy(key)
+
+	def _fuzzy(self, key: str) -> Optional[Place]:
+		keys = self._keys
+		start = bisect_left(keys, key[0])
+		end = bisect_left(keys, chr(ord(key[0]) + 1))
+		matcher = difflib.SequenceMatcher()
+		matcher.set_seq2(key)
+		best, best_ratio = None, self.FUZZY_CUTOFF
+		for index in range(start, end):
+			candidate = keys[index]
+			if abs(len(candidate) - len(key)) > 3:
+				continue
+			matcher.set_seq1(candidate)
+			if matcher.real_quick_ratio() < best_ratio or matcher.quick_ratio() < best_ratio:
+				continue
+			ratio = matcher.ratio()
+			if ratio < best_ratio:
+				continue
+			if best is None or ratio > best_ratio or self._populations[index] > self._populations[best]:
+				best, best_ratio = index, ratio
+		return self._place(best, "fuzzy") if best is not None else None
+
+
+gazetteer = Gazetteer.from_csv(Config.WEATHER_GAZETTEER_FILE)
@@ -0,0 +1,62 @@
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Optional, Tuple, Union
+
+from config import Config
+from logger import logger, ErrorMessage
+
+
+class GeocodeCache:
+	"""
+	City name -> (latitude, longitude), persisted as JSON. Entries never expire: cities don't move.
+
+	The whole table is loaded at startup and rewritten (atomically) on each new city.
+	"""
+
+	def __init__(self, path: Union[str, Path]):
+		self._path = Path(path)
+		self._lock = threading.Lock()
+		self._coordinates: dict[str, Tuple[float, float]] = {}
+		self.hits = 0
+		self.misses = 0
+		self._load()
+
+	@staticmethod
+	def key(city: str) -> str:
+		return " ".join(city.lower().split())
+
+	def _load(self) -> None:
+		if not self._path.exists():
+			return
+		try:
+			with open(self._path, encoding="utf-8") as f:
+				self._coordinates = {city: tuple(coordinates) for city, coordinates in json.load(f).items()}
+		except Exception as e:
+			logger.log(ErrorMessage(content=f"{self.__class__.__name__} : _load: {e}"))
+
+	def get(self, city: str) -> Optional[Tuple[float, float]]:
+		coordinates = self._coordinates.get(self.key(city))
+		if coordinates is None:
+			self.misses += 1
+		else:
+			self.hits += 1
+		return coordinates
+
+	def put(self, city: str, latitude: float, longitude: float) -> None:
+		with self._lock:
+			self._coordinates[self.key(city)] = (latitude, longitude)
+			try:
+				tmp_path = self._path.with_suffix(self._path.suffix + ".tmp")
+				with open(tmp_path, "w", encoding="utf-8") as f:
+					json.dump(self._coordinates, f, ensure_ascii=False)
+				os.replace(tmp_path, self._path)
+			except Exception as e:
+				logger.log(ErrorMessage(content=f"{self.__class__.__name__} : put: {e}"))
+
+	def __len__(self) -> int:
+		return len(self._coordinates)
+
+
+geocode_cache = GeocodeCache(Config.WEATHER_GEOCODE_CACHE_FILE)
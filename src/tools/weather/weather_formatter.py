@@ -0,0 +1,113 @@
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+	from openmeteo_sdk import WeatherApiResponse
+
+# Order of the hourly variables requested from open-meteo
+HOURLY_VARIABLES = ["temperature_2m", "precipitation_probability", "precipitation", "wind_speed_10m"]
+
+DEFINITIONS = (
+	"Here are some definitions:"
+	"- temperature_2m: Air temperature at 2 meters above ground in °C"
+	"- precipitation_probability: Probability of precipitation in %"
+	"- precipitation: Precipitation in mm"
+	"- wind_speed_10m: Wind speed at 10 meters above ground in km/h\n"
+)
+
+# Start hours of the daily cycle ride to and from work
+COMMUTE_HOURS = (8, 19)
+# An hour is rainy from this probability (%) or this amount (mm)
+RAIN_PROBABILITY = 50
+RAIN_AMOUNT = 0.2
+
+
+def hourly_values(response: "WeatherApiResponse") -> tuple[np.ndarray, dict[str, np.ndarray]]:
+	"""
+	Hourly arrays of an open-meteo response, straight from ValuesAsNumpy().
+
+	Returns:
+		Local times (datetime64[s], in the response's UTC offset) and one array per HOURLY_VARIABLES.
+	"""
+	hourly = response.Hourly()
+	times = np.arange(hourly.Time(), hourly.TimeEnd(), hourly.Interval(), dtype=np.int64)
+	times = (times + response.UtcOffsetSeconds()).astype("datetime64[s]")
+	values = {name: hourly.Variables(i).ValuesAsNumpy() for i, name in enumerate(HOURLY_VARIABLES)}
+	return times, values
+
+
+def split_days(times: np.ndarray, values: dict[str, np.ndarray]) -> dict[str, tuple[np.ndarray, dict[str, np.ndarray]]]:
+	"""Hourly arrays cut per local day: {"YYYY-MM-DD": (times, values)}."""
+	days = times.astype("datetime64[D]")
+	result = {}
+	for day in np.unique(days):
+		mask = days == day
+		result[str(day)] = (times[mask], {name: column[mask] for name, column in values.items()})
+	return result
+
+
+def format_hourly_csv(times: np.ndarray, values: dict[str, np.ndarray]) -> str:
+	"""One CSV row per hour, as the former DataFrame.to_csv() with values rounded to 0.1."""
+	dates = np.datetime_as_string(times, unit="m")
+	columns = [values[name] for name in HOURLY_VARIABLES]
+	lines = [",".join(["date"] + HOURLY_VARIABLES)]
+	for i, moment in enumerate(dates):
+		lines.append(",".join([moment.replace("T", " ")] + [f"{column[i]:.1f}" for column in columns]))
+	return "\n".join(lines) + "\n"
+
+
+def _rain_windows(hours: np.ndarray, rainy: np.ndarray) -> list[str]:
+	"""Consecutive rainy hours as "14h-17h" ranges."""
+	windows = []
+	start = None
+	for hour, is_rainy in zip(hours, rainy):
+		if is_rainy and start is None:
+			start = hour
+		elif not is_rainy and start is not None:
+			windows.append(f"{start}h-{hour}h")
+			start = None
+	if start is not None:
+		windows.append(f"{start}h-{hours[-1] + 1}h")
+	return windows
+
+
+def format_summary(times: np.ndarray, values: dict[str, np.ndarray]) -> str:
+	"""A few lines per day: temperature range, rain windows, wind, and the commute hours."""
+	temperature = values["temperature_2m"]
+	probability = values["precipitation_probability"]
+	precipitation = values["precipitation"]
+	wind = values["wind_speed_10m"]
+	days = times.astype("datetime64[D]")
+	hours = (times.astype("datetime64[h]").astype(np.int64) % 24).astype(int)
+
+	lines = []
+	for day in np.unique(days):
+		mask = days == day
+		day_hours = hours[mask]
+		day_temperature = temperature[mask]
+		coldest, warmest = int(np.argmin(day_temperature)), int(np.argmax(day_temperature))
+		rainy = (probability[mask] >= RAIN_PROBABILITY) | (precipitation[mask] >= RAIN_AMOUNT)
+		windows = _rain_windows(day_hours, rainy)
+		windiest = int(np.argmax(wind[mask]))
+
+		line = (
+			f"{day}: {day_temperature[coldest]:.0f}°C at {day_hours[coldest]}h to "
+			f"{day_temperature[warmest]:.0f}°C at {day_hours[warmest]}h; "
+			f"rain {precipitation[mask].sum():.1f} mm, max probability {probability[mask].max():.0f}%"
+		)
+		line += f", rainy {', '.join(windows)}" if windows else ", no rainy hour"
+		line += f"; wind up to {wind[mask][windiest]:.0f} km/h at {day_hours[windiest]}h"
+		commute = []
+		for hour in COMMUTE_HOURS:
+			index = np.flatnonzero(day_hours == hour)
+			if len(index):
+				i = np.flatnonzero(mask)[index[0]]
+				commute.append(
+					f"{hour}h {temperature[i]:.0f}°C, rain {probability[i]:.0f}% {precipitation[i]:.1f} mm, "
+					f"wind {wind[i]:.0f} km/h"
+				)
+		if commute:
+			line += f". Commute: {'; '.join(commute)}"
+		lines.append(line)
+	return "\n".join(lines) + "\n"
@@ -0,0 +1,120 @@
+from abc import ABC
+from typing import TYPE_CHECKING, Optional
+
+import numpy as np
+
+from logger import logger, AppMessage, ErrorMessage
+from ..tool import Tool
+from .forecast_cache import forecast_cache
+from .gazetteer import gazetteer
+from .geocode_cache import geocode_cache
+from .weather_formatter import HOURLY_VARIABLES, hourly_values, split_days
+
+if TYPE_CHECKING:
+	from openmeteo_sdk import WeatherApiResponse
+
+
+class WeatherTool(Tool, ABC):
+	"""
+	Shared by the weather tools: city lookup and open-meteo forecasts, both cached.
+
+	Forecasts are cached per (coordinates, day), so a day fetched by any tool is
+	served from the cache to all of them. The open-meteo and Nominatim clients
+	are only imported and built on first use: they are slow to import and most
+	lookups never reach them.
+	"""
+
+	API_URL = "https://api.open-meteo.com/v1/forecast"
+
+	def __init__(self):
+		self._openmeteo = None
+		self._geolocator = None
+
+	@property
+	def openmeteo(self):
+		if self._openmeteo is None:
+			import openmeteo_requests
+			self._openmeteo = openmeteo_requests.Client()
+		return self._openmeteo
+
+	@property
+	def geolocator(self):
+		if self._geolocator is None:
+			from geopy.geocoders import Nominatim
+			self._geolocator = Nominatim(user_agent="geoapi")
+		return self._geolocator
+
+	def _get_coordinates(self, city_name) -> Optional[tuple[float, float]]:
+		"""
+		Exact gazetteer match, else the geocode cache, else Nominatim.
+
+		A prefix or fuzzy gazetteer match is only a fallback, used when Nominatim
+		finds nothing or cannot be reached: a partial name must not silently
+		resolve to another city.
+		"""
+		place = gazetteer.lookup(city_name)
+		if place is not None and place.match == "exact":
+			return place.latitude, place.longitude
+		coordinates = geocode_cache.get(city_name)
+		if coordinates is not None:
+			return coordinates
+		try:
+			location = self.geolocator.geocode(city_name)
+		except Exception as e:
+			if place is None:
+				raise
+			logger.log(ErrorMessage(content=f"{self.__class__.__name__} : _get_coordinates: {e}"))
+			location = None
+		if location:
+			geocode_cache.put(city_name, location.latitude, location.longitude)
+			return location.latitude, location.longitude
+		if place is not None:
+			logger.log(AppMessage(content=f"{self.__class__.__name__}: {city_name} resolved offline to {place.name} ({place.match} match)"))
+			return place.latitude, place.longitude
+		return None
+
+	def _call_api(self, coordinates: list[tuple[float, float]], start_date: str, end_date: str) -> list["WeatherApiResponse"]:
+		"""One request for all the locations; one response per location, in order."""
+		params = {
+			"latitude": [latitude for latitude, _ in coordinates],
+			"longitude": [longitude for _, longitude in coordinates],
+			"hourly": HOURLY_VARIABLES,
+			"timezone": "auto",
+			"start_date": start_date,
+			"end_date": end_date
+		}
+		return self.openmeteo.weather_api(self.API_URL, params=params)
+
+	def _get_forecasts(self, coordinates: list[tuple[float, float]], start_date: str, end_date: str) -> list[dict[str, tuple]]:
+		"""
+		Hourly forecasts of each location for each day from start_date to end_date (local dates).
+
+		Locations with a day missing from the cache are fetched together, in a single request.
+
+		Returns:
+			For each location, {"YYYY-MM-DD": (times, values)} as returned by hourly_values().
+		"""
+		days = [str(day) for day in np.arange(np.datetime64(start_date), np.datetime64(end_date) + 1)]
+		forecasts: list[dict[str, tuple]] = [{} for _ in coordinates]
+		missing = []
+		for index, (latitude, longitude) in enumerate(coordinates):
+			for day in days:
+				forecast = forecast_cache.get(forecast_cache.key(latitude, longitude, day))
+				if forecast is None:
+					missing.append(index)
+					break
+				forecasts[index][day] = forecast
+
+		if missing:
+			responses = self._call_api([coordinates[index] for index in missing], start_date, end_date)
+			for index, response in zip(missing, responses):
+				latitude, longitude = coordinates[index]
+				for day, forecast in split_days(*hourly_values(response)).items():
+					forecast_cache.put(forecast_cache.key(latitude, longitude, day), forecast)
+					if day in days:
+						forecasts[index][day] = forecast
+		logger.log(AppMessage(
+			content=f"{self.__class__.__name__}: {len(missing)}/{len(coordinates)} locations fetched, "
+					f"forecast cache: {forecast_cache.stats()}"
+		))
+		return forecasts
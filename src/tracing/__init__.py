@@ -0,0 +1,4 @@
+from .turn_trace import TurnTrace
+from .trace_store import TraceStore, SPANS, trace_store
+
+__all__ = ["TurnTrace", "TraceStore", "SPANS", "trace_store"]
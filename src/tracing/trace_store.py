@@ -0,0 +1,157 @@
+import json
+import os
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Optional, Union
+
+import numpy as np
+
+from config import Config
+from log_store import BackgroundLogWriter
+from logger import logger, ErrorMessage
+from .turn_trace import TurnTrace
+
+# Aggregated intervals: name, start mark, end mark
+SPANS = [
+    ("wake_to_mic_open", "wake_word", "mic_open"),
+    ("wake_to_chime_done", "wake_word", "chime_done"),
+    ("wake_to_session_connected", "wake_word", "session_connected"),
+    ("connect", "connect_start", "session_connected"),
+    ("first_uplink_to_speech_end", "first_uplink", "speech_end"),
+    ("speech_end_to_first_audio", "speech_end", "first_audio"),
+    ("first_audio_to_first_sample_played", "first_audio", "first_sample_played"),
+    ("speech_end_to_first_sample_played", "speech_end", "first_sample_played"),
+    ("last_sample_played_to_listener_resumed", "last_sample_played", "listener_resumed"),
+    ("turn", "wake_word", "listener_resumed"),
+]
+
+
+def _tail_lines(path: Path, count: int, block_size: int = 65536) -> list[bytes]:
+    """Last `count` lines of a file, read backwards block by block."""
+    with open(path, "rb") as f:
+        position = f.seek(0, os.SEEK_END)
+        data = b""
+        while position > 0 and data.count(b"\n") <= count:
+            step = min(block_size, position)
+            position -= step
+            f.seek(position)
+            data = f.read(step) + data
+    return data.splitlines()[-count:]
+
+
+def _rotated_path(path: Path) -> Path:
+    return path.with_name(path.name + ".1")
+
+
+class _TraceFile:
+    """
+    Append-only JSONL file of traces, written from a BackgroundLogWriter thread.
+
+    Past max_size bytes it replaces the previous rotated file (``<path>.1``),
+    so the traces on disk never exceed twice that size.
+    """
+
+    def __init__(self, path: Path, max_size: Optional[int] = None):
+        self._path = path
+        self._max_size = max_size
+
+    def append_many(self, records: list) -> None:
+        try:
+            with open(self._path, "a", encoding="utf-8") as f:
+                f.writelines(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+                size = f.tell()
+            if self._max_size is not None and size >= self._max_size:
+                os.replace(self._path, _rotated_path(self._path))
+        except Exception as e:
+            logger.log(ErrorMessage(content=f"TraceStore : append: {e}"))
+
+    def close(self) -> None:
+        pass
+
+
+class TraceStore:
+    """
+    Persists one JSON line per finished turn and aggregates the recent ones.
+
+    The last `keep` turns stay in memory (read from the end of the files at
+    startup), so summaries never re-read the file. `append` runs at the end
+    of a turn, on the event loop: the file is written by a background writer
+    thread, so persisting a trace adds no latency to the next turn. The file
+    is rotated past `max_file_size` bytes, keeping a single older file.
+    """
+
+    def __init__(self, path: Union[str, Path], keep: int = 500, max_file_size: Optional[int] = None):
+        self._path = Path(path)
+        self._lock = threading.Lock()
+        self._records: deque = deque(maxlen=keep)
+        self._load()
+        self._writer = BackgroundLogWriter(_TraceFile(self._path, max_file_size), max_queue_size=keep)
+
+    def _load(self) -> None:
+        keep = self._records.maxlen
+        try:
+            lines = []
+            for path in (_rotated_path(self._path), self._path):
+                if path.exists():
+                    lines += _tail_lines(path, keep)
+            for line in lines[-keep:]:
+                try:
+                    self._records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+        except Exception as e:
+            logger.log(ErrorMessage(content=f"{self.__class__.__name__} : _load: {e}"))
+
+    def append(self, trace: TurnTrace) -> dict:
+        """Persist a finished turn; returns its record."""
+        record = trace.to_record()
+        with self._lock:
+            self._records.append(record)
+        self._writer.submit(record)
+        return record
+
+    def flush(self, timeout: Optional[float] = 5.0) -> bool:
+        """Block until the traces appended so far are written."""
+        return self._writer.flush(timeout)
+
+    def recent(self, limit: int = 20) -> list:
+        """Most recent turns, newest first."""
+        with self._lock:
+            records = list(self._records)
+        return records[::-1][:limit]
+
+    def summary(self, limit: Optional[int] = None) -> dict:
+        """
+        count/p50/p95/max in ms of each interval of SPANS and of each span name (tools),
+        over the last `limit` turns (all the ones kept by default).
+        """
+        with self._lock:
+            records = list(self._records)
+        if limit:
+            records = records[-limit:]
+
+        durations = {name: [] for name, _, _ in SPANS}
+        for record in records:
+            marks = record["marks"]
+            for name, start, end in SPANS:
+                if start in marks and end in marks:
+                    durations[name].append(marks[end] - marks[start])
+            for span in record.get("spans", []):
+                durations.setdefault(span["name"], []).append(span["duration"])
+
+        spans = {}
+        for name, values in durations.items():
+            if not values:
+                continue
+            values = np.array(values)
+            spans[name] = {
+                "count": len(values),
+                "p50_ms": round(float(np.percentile(values, 50)), 1),
+                "p95_ms": round(float(np.percentile(values, 95)), 1),
+                "max_ms": round(float(values.max()), 1),
+            }
+        return {"turns": len(records), "spans": spans}
+
+
+trace_store = TraceStore(Config.TRACES_FILE, keep=Config.TRACES_KEEP, max_file_size=Config.TRACES_MAX_FILE_SIZE)
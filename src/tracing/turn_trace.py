@@ -0,0 +1,64 @@
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+
+class TurnTrace:
+    """
+    Timestamps of one voice turn, from wake word detection to the listener resuming.
+
+    Marks are named points in time, spans have a start and an end (e.g. one
+    per tool call). All times come from time.monotonic(), so they can be set
+    from any thread (audio callbacks included) and compared with each other;
+    they are only turned into offsets from the start of the turn when the
+    trace is persisted.
+    """
+
+    def __init__(self):
+        self.started_at = datetime.now()
+        self.marks: Dict[str, float] = {}
+        self.spans: List[dict] = []
+        self._open_spans: Dict[str, float] = {}
+
+    def mark(self, name: str, at: Optional[float] = None, overwrite: bool = False) -> float:
+        """
+        Record the time of `name` (now by default). The first time is kept unless `overwrite`.
+
+        Returns:
+            The recorded time.
+        """
+        if overwrite or name not in self.marks:
+            self.marks[name] = time.monotonic() if at is None else at
+        return self.marks[name]
+
+    def begin(self, name: str, at: Optional[float] = None) -> None:
+        """Open a span; a span with the same name must be ended before it can be opened again."""
+        self._open_spans[name] = time.monotonic() if at is None else at
+
+    def end(self, name: str, at: Optional[float] = None) -> None:
+        start = self._open_spans.pop(name, None)
+        if start is not None:
+            self.spans.append({"name": name, "start": start, "end": time.monotonic() if at is None else at})
+
+    def elapsed(self, start: str, end: str) -> Optional[float]:
+        """Seconds between two marks, None if one is missing."""
+        if start in self.marks and end in self.marks:
+            return self.marks[end] - self.marks[start]
+        return None
+
+    def to_record(self) -> dict:
+        """Serializable form: mark and span times in ms from the earliest mark."""
+        times = list(self.marks.values()) + [span["start"] for span in self.spans]
+        origin = min(times) if times else 0.0
+
+        def to_ms(t: float) -> float:
+            return round((t - origin) * 1000, 1)
+
+        return {
+            "started_at": self.started_at.isoformat(),
+            "marks": {name: to_ms(t) for name, t in sorted(self.marks.items(), key=lambda item: item[1])},
+            "spans": [
+                {"name": span["name"], "start": to_ms(span["start"]), "duration": round((span["end"] - span["start"]) * 1000, 1)}
+                for span in self.spans
+            ],
+        }